@@ -0,0 +1,60 @@
+"""
+Cold storage for completed events: their donations move from core_donation
+to core_archiveddonation, keeping ids and dates, and the event's counters
+are frozen. Reads that span both go through DonationRecord.
+"""
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import ArchivedDonation, Donation, Event
+from .response_cache import bump_versions
+
+
+DONATION_COLUMNS = ("id", "event_id", "donor_id", "amount", "date")
+
+
+def delete_donations(ids):
+    # Plain SQL: the post_delete signal would take the donations off the
+    # counters, rollups and leaderboards they still belong to.
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {Donation._meta.db_table} WHERE id IN ({placeholders})", ids)
+
+
+def archive_event(event_id, batch_size=1000):
+    """
+    Move one event's donations to ArchivedDonation, batch_size rows at a
+    time, and freeze its counters, all in one transaction so readers see
+    every donation exactly once. Returns the number moved, or None when the
+    event is gone or already archived.
+    """
+    with transaction.atomic():
+        # Donation writes update this row too, so the lock holds them off
+        # (and DonationSerializer.create refuses archived events after it).
+        event = Event.objects.select_for_update().filter(pk=event_id, archived_at__isnull=True).first()
+        if event is None:
+            return None
+
+        moved = 0
+        while True:
+            rows = list(
+                Donation.objects.filter(event_id=event_id).order_by("id")
+                .values(*DONATION_COLUMNS)[:batch_size]
+            )
+            if not rows:
+                break
+            ArchivedDonation.objects.bulk_create(ArchivedDonation(**row) for row in rows)
+            delete_donations([row["id"] for row in rows])
+            moved += len(rows)
+
+        final = ArchivedDonation.objects.filter(event_id=event_id).aggregate(
+            count=Count("id"), total=Sum("amount")
+        )
+        Event.objects.filter(pk=event_id).update(
+            donation_count=final["count"],
+            donation_total=final["total"] or 0,
+            archived_at=timezone.now(),
+        )
+        bump_versions(event_id)
+    return moved
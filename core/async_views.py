@@ -0,0 +1,296 @@
+"""
+Async variants of the read-heavy endpoints, mounted under /api/async/.
+
+Same response shapes and permissions as core/views.py, but the queries go
+through the async ORM, so under an ASGI server (uvicorn gentle_backend.asgi)
+a worker keeps serving other requests while one waits on the database.
+DRF views are sync-only, so these are plain Django views that borrow DRF's
+authentication, permissions, filters and serializers.
+"""
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.filters import SearchFilter
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from . import metrics
+from .auth import role_for
+from .models import DonationRecord, Event
+from .response_cache import (
+    GLOBAL_VERSION_KEY,
+    aget_versions,
+    event_version_key,
+    get_cache,
+    is_not_modified,
+    make_entry,
+    response_cache_key,
+)
+from .search import get_search_backend
+from .serializers import DonationSerializer, EventSerializer
+from .throttling import page_size_cost
+from .views import (
+    DonationCursorPagination,
+    DonationListCreateView,
+    DonationSummaryView,
+    EventListCreateView,
+    SummaryQuery,
+    SummaryStream,
+    positive_param,
+    summary_queryset,
+)
+
+
+def json_response(data, status=status.HTTP_200_OK, headers=None):
+    return JsonResponse(data, status=status, headers=headers, encoder=JSONEncoder, safe=False)
+
+
+# ==============================
+# BASE VIEW
+# ==============================
+class AsyncAPIView(View):
+    """
+    GET-only async view. Authentication and permissions work like DRF's
+    APIView; errors come back as {"detail": ...} with DRF's status codes.
+    """
+    http_method_names = ["get", "head", "options"]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = []
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, authenticators=[
+            auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ])
+        self.request = request
+        try:
+            # Token checks may touch the cache/database on a TTL miss.
+            await sync_to_async(lambda: request.user)()
+            self.check_permissions(request)
+            if self.throttle_classes:
+                await sync_to_async(self.check_throttles)(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            return self.handle_exception(exc)
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def check_throttles(self, request):
+        waits = []
+        for throttle in [throttle() for throttle in self.throttle_classes]:
+            if not throttle.allow_request(request, self):
+                waits.append(throttle.wait())
+        if waits:
+            raise exceptions.Throttled(max(waits))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticator = self.request.authenticators[0]
+            headers["WWW-Authenticate"] = authenticator.authenticate_header(self.request)
+            exc.status_code = status.HTTP_401_UNAUTHORIZED
+        if getattr(exc, "wait", None) is not None:
+            headers["Retry-After"] = str(math.ceil(exc.wait))
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        return json_response(data, status=exc.status_code, headers=headers)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        raise exceptions.MethodNotAllowed(request.method)
+
+
+class AsyncCachedResponseMixin:
+    """core.response_cache.CachedResponseMixin for AsyncAPIView."""
+
+    def get_cache_version_keys(self):
+        return [GLOBAL_VERSION_KEY]
+
+    async def get(self, request, *args, **kwargs):
+        cache = get_cache()
+        versions = await aget_versions(self.get_cache_version_keys())
+        key = response_cache_key(request, versions)
+        entry = await cache.aget(key)
+
+        if entry is None:
+            metrics.incr("response_cache.miss")
+            entry = make_entry(await self.get_data(request, *args, **kwargs))
+            await cache.aset(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+        else:
+            metrics.incr("response_cache.hit")
+
+        if is_not_modified(request, entry):
+            metrics.incr("response_cache.not_modified")
+            response = HttpResponseNotModified()
+        else:
+            response = json_response(entry["data"])
+        response["ETag"] = entry["etag"]
+        return response
+
+
+# ==============================
+# PAGINATION
+# ==============================
+async def page_number_page(request, queryset, page_size):
+    """
+    PageNumberPagination for the async ORM: (rows, {"count", "next",
+    "previous"}) with the same links and "Invalid page." errors.
+    """
+    count = await queryset.acount()
+    num_pages = max(math.ceil(count / page_size), 1)
+
+    page = request.query_params.get("page", 1)
+    if page == "last":
+        page = num_pages
+    try:
+        page = int(page)
+    except (TypeError, ValueError):
+        raise exceptions.NotFound("Invalid page.")
+    if page < 1 or page > num_pages:
+        raise exceptions.NotFound("Invalid page.")
+
+    start = (page - 1) * page_size
+    rows = [row async for row in queryset[start:start + page_size]]
+
+    url = request.build_absolute_uri()
+    next_link = replace_query_param(url, "page", page + 1) if page < num_pages else None
+    if page <= 1:
+        previous_link = None
+    elif page == 2:
+        previous_link = remove_query_param(url, "page")
+    else:
+        previous_link = replace_query_param(url, "page", page - 1)
+    return rows, {"count": count, "next": next_link, "previous": previous_link}
+
+
+def serialize(serializer_class, rows, request, many=True):
+    return serializer_class(rows, many=many, context={"request": request}).data
+
+
+# ==============================
+# EVENTS
+# ==============================
+class AsyncEventListView(AsyncCachedResponseMixin, AsyncAPIView):
+    permission_classes = [AllowAny]
+
+    async def get_data(self, request):
+        queryset = Event.objects.order_by("-date")
+        term = " ".join(SearchFilter().get_search_terms(request))
+        if term:
+            backend = await sync_to_async(get_search_backend)()
+            queryset = backend.search(queryset, term, fields=EventListCreateView.search_fields, rank=True)
+
+        rows, page = await page_number_page(request, queryset, api_settings.PAGE_SIZE)
+        return {**page, "results": serialize(EventSerializer, rows, request)}
+
+
+class AsyncEventDetailView(AsyncCachedResponseMixin, AsyncAPIView):
+    permission_classes = [AllowAny]
+
+    def get_cache_version_keys(self):
+        return [event_version_key(self.kwargs["pk"])]
+
+    async def get_data(self, request, pk):
+        event = await aget_object_or_404(Event, pk=pk)
+        return serialize(EventSerializer, event, request, many=False)
+
+
+# ==============================
+# DONATIONS
+# ==============================
+class AsyncDonationListView(AsyncAPIView):
+    """Same query modes and throttle as DonationListCreateView's GET."""
+    search_fields = DonationListCreateView.search_fields
+    throttle_classes = DonationListCreateView.throttle_classes
+    throttle_scope = DonationListCreateView.throttle_scope
+
+    def get_throttle_cost(self, request):
+        page_size_param = DonationListCreateView.pagination_class.page_size_query_param
+        return page_size_cost(request.query_params.get(page_size_param))
+
+    async def get(self, request, event_id):
+        queryset = DonationRecord.objects.filter(
+            event_id=event_id
+        ).select_related("donor", "event").order_by("-date", "-id")
+        queryset = SearchFilter().filter_queryset(request, queryset, self)
+
+        if DonationCursorPagination.cursor_query_param in request.query_params:
+            paginator = DonationCursorPagination()
+            rows = await paginator.apaginate_queryset(queryset, request)
+            return json_response({
+                "next": paginator.get_next_link(),
+                "results": serialize(DonationSerializer, rows, request),
+            })
+
+        page_size = positive_param(request.query_params, "page_size", api_settings.PAGE_SIZE)
+        rows, page = await page_number_page(request, queryset, page_size)
+        return json_response({**page, "results": serialize(DonationSerializer, rows, request)})
+
+
+class AsyncDonationSummaryView(AsyncAPIView):
+    """Same query modes and throttle as DonationSummaryView."""
+    throttle_classes = DonationSummaryView.throttle_classes
+    throttle_scope = DonationSummaryView.throttle_scope
+    get_throttle_cost = DonationSummaryView.get_throttle_cost
+
+    async def get(self, request):
+        query = SummaryQuery(request.GET)
+        if query.search:
+            # Resolving the backend may introspect the database once.
+            await sync_to_async(get_search_backend)()
+        qs = summary_queryset(query.search)
+
+        if query.stream:
+            return self.stream_all(qs)
+
+        if query.cursor is not None:
+            return json_response(query.cursor_page([row async for row in query.cursor_rows(qs)]))
+
+        rows = [row async for row in query.numbered_rows(qs)]
+        count = await qs.acount() if query.needs_count(rows) else None
+        return json_response(query.numbered_page(rows, count))
+
+    def stream_all(self, qs):
+        async def body():
+            stream = SummaryStream()
+            yield stream.head
+            async for row in qs.aiterator(chunk_size=stream.chunk_size):
+                yield stream.row(row)
+            yield stream.tail()
+
+        return StreamingHttpResponse(body(), content_type="application/json")
+
+
+# ==============================
+# USER PROFILE
+# ==============================
+class AsyncUserProfileView(AsyncAPIView):
+
+    async def get(self, request):
+        user = request.user
+        groups = getattr(user, "group_names", None)
+        if groups is None:
+            groups = [g.name.lower() async for g in user.groups.all()]
+
+        return json_response({
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "role": role_for(user),
+            "groups": groups,
+        })
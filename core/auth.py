@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import UserTokenVersion
+from .ttlcache import TTLCache
+
+
+VERSION_CLAIM = "ver"
+ROLE_CLAIM = "role"
+
+# Per-process caches in front of the database. Revocations reach other
+# processes when their entries expire, within AUTH_CACHE_TTL seconds.
+_versions = TTLCache(ttl=settings.AUTH_CACHE_TTL, maxsize=10_000)
+_users = TTLCache(ttl=settings.AUTH_CACHE_TTL, maxsize=10_000)
+
+
+def role_for(user):
+    if user.is_superuser:
+        return "admin"
+    elif user.is_staff:
+        return "hr"
+    return "employee"
+
+
+# ==============================
+# TOKEN VERSIONS (REVOCATION)
+# ==============================
+def token_version(user_id):
+    # The database is the only shared copy: a cache entry that never
+    # expires would outlive a revocation made by another process.
+    return _versions.get_or_set(user_id, lambda: (
+        UserTokenVersion.objects.filter(user_id=user_id)
+        .values_list("version", flat=True).first()
+    ) or 0)
+
+
+def revoke_tokens(user_id):
+    """
+    Invalidate every token issued so far: at once in this process, and in
+    the others once their AUTH_CACHE_TTL entry expires.
+    """
+    UserTokenVersion.objects.get_or_create(user_id=user_id)
+    UserTokenVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+
+    def forget():
+        _versions.delete(user_id)
+        _users.delete(user_id)
+
+    forget()
+    # Again after commit, in case a request cached the old row meanwhile.
+    transaction.on_commit(forget)
+
+
+def claim_user_id(token):
+    # simplejwt serializes the id as a string.
+    user_id = token[api_settings.USER_ID_CLAIM]
+    return int(user_id) if str(user_id).isdigit() else user_id
+
+
+def check_version(token):
+    if token.get(VERSION_CLAIM, 0) != token_version(claim_user_id(token)):
+        raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+
+
+# ==============================
+# TOKENS
+# ==============================
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embeds identity, role and group claims so requests need no user lookup."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        token["email"] = user.email
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token[ROLE_CLAIM] = role_for(user)
+        token["groups"] = [g.name.lower() for g in user.groups.all()]
+        token[VERSION_CLAIM] = token_version(user.id)
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        check_version(RefreshToken(attrs["refresh"]))
+        return super().validate(attrs)
+
+
+# ==============================
+# AUTHENTICATION
+# ==============================
+class ClaimsUser(TokenUser):
+    """request.user built from token claims; get_db_user() for the real row."""
+
+    @cached_property
+    def id(self):
+        return claim_user_id(self.token)
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def role(self):
+        return self.token.get(ROLE_CLAIM, "employee")
+
+    @cached_property
+    def group_names(self):
+        return list(self.token.get("groups", []))
+
+    def get_db_user(self):
+        return _users.get_or_set(self.id, lambda: User.objects.filter(pk=self.id).first())
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Stateless JWT auth: the user comes from the token claims and revocation
+    is a cached token-version comparison, so hot read paths run no auth
+    queries. Tokens issued before claims were embedded fall back to the
+    regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+        user = super().get_user(validated_token)
+        check_version(validated_token)
+        return user
+
+
+def db_user(user):
+    """The User row behind request.user (cached for ClaimsUser)."""
+    return user.get_db_user() if isinstance(user, ClaimsUser) else user
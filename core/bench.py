@@ -0,0 +1,281 @@
+"""
+Benchmark harness behind `manage.py run_bench`.
+
+Each scenario is one request against a route in core/urls.py. In-process
+runs go through django.test.Client and also record SQL query counts; with
+a base URL the same scenarios hit a live server (e.g. gunicorn serving
+gentle_backend.wsgi) over HTTP.
+
+The async_* scenarios are the /api/async/ twins of the read endpoints. To
+compare deployments on one box, serve the same database with
+`gunicorn gentle_backend.wsgi` and then `uvicorn gentle_backend.asgi`, and
+run `run_bench --base-url ... --concurrency N` against each.
+"""
+import json
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .models import Event
+
+
+# ==============================
+# TRANSPORTS
+# ==============================
+class InProcessTransport:
+    """django.test.Client against the configured database; counts queries."""
+    counts_queries = True
+
+    def __init__(self):
+        self.client = Client(HTTP_HOST="localhost")
+
+    def request(self, method, path, data=None, token=None):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        if method == "GET":
+            response = self.client.get(path, data or {}, secure=True, **headers)
+        else:
+            response = self.client.post(
+                path, json.dumps(data or {}), content_type="application/json", secure=True, **headers
+            )
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, body
+
+
+class HTTPTransport:
+    """Plain urllib against a running server; no query counts."""
+    counts_queries = False
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, path, data=None, token=None):
+        url = self.base_url + path
+        body = None
+        if method == "GET" and data:
+            url += "?" + urllib.parse.urlencode(data)
+        elif method == "POST":
+            body = json.dumps(data or {}).encode()
+        request = urllib.request.Request(url, data=body, method=method)
+        request.add_header("Content-Type", "application/json")
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+
+# ==============================
+# SCENARIOS
+# ==============================
+# Read endpoints that also have an async view under /api/async/.
+ASYNC_SCENARIOS = (
+    "event_list",
+    "event_list_search",
+    "event_detail",
+    "donation_list",
+    "donation_list_cursor",
+    "donation_summary",
+    "donation_summary_cursor",
+    "user_profile",
+)
+
+
+def build_scenarios(transport, username, password, admin_username):
+    """Resolve tokens and sample ids, then return {name: (method, path, data, token)}."""
+    def token_for(user):
+        status, body = transport.request("POST", "/api/token/", {"username": user, "password": password})
+        if status != 200:
+            raise RuntimeError(f"Could not obtain a token for {user!r} (HTTP {status}).")
+        return json.loads(body)
+
+    tokens = token_for(username)
+    admin = token_for(admin_username)["access"]
+    access, refresh = tokens["access"], tokens["refresh"]
+
+    event = Event.objects.order_by("-donation_count").only("id", "title").first()
+    if event is None:
+        raise RuntimeError("No events found; run `manage.py seed_bench` first.")
+    word = event.title.split()[-1]
+
+    scenarios = {
+        "token_obtain": ("POST", "/api/token/", {"username": username, "password": password}, None),
+        "token_refresh": ("POST", "/api/token/refresh/", {"refresh": refresh}, None),
+        "event_list": ("GET", "/api/events/", None, None),
+        "event_list_search": ("GET", "/api/events/", {"search": word}, None),
+        "event_detail": ("GET", f"/api/events/{event.id}/", None, None),
+        "donation_list": ("GET", f"/api/events/{event.id}/donations/", None, access),
+        "donation_list_cursor": ("GET", f"/api/events/{event.id}/donations/", {"cursor": ""}, access),
+        "donation_create": ("POST", f"/api/events/{event.id}/donations/", {"amount": "10.00"}, access),
+        "donation_summary": ("GET", "/api/donations/summary/", None, access),
+        "donation_summary_cursor": ("GET", "/api/donations/summary/", {"cursor": ""}, access),
+        "donation_leaderboard": ("GET", "/api/donations/leaderboard/", None, access),
+        "event_leaderboard": ("GET", f"/api/events/{event.id}/leaderboard/", None, access),
+        "donation_timeseries": ("GET", "/api/donations/timeseries/", None, access),
+        "donation_timeseries_event": ("GET", "/api/donations/timeseries/", {"event": event.id}, access),
+        "donation_summary_export": ("GET", "/api/donations/summary/export/", None, access),
+        "donation_export_event": ("GET", "/api/donations/export/", {"event": event.id}, admin),
+        "user_profile": ("GET", "/api/user/", None, access),
+        "user_donations": ("GET", "/api/user/donations/", None, access),
+        "metrics": ("GET", "/api/metrics/", None, admin),
+    }
+    for name in ASYNC_SCENARIOS:
+        method, path, data, token = scenarios[name]
+        scenarios[f"async_{name}"] = (method, path.replace("/api/", "/api/async/", 1), data, token)
+    return scenarios
+
+
+# ==============================
+# RUNNER
+# ==============================
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_scenario(transport, scenario, requests, warmup=2, concurrency=1, cold_cache=False):
+    method, path, data, token = scenario
+
+    def one(_):
+        if cold_cache:
+            cache.clear()
+        start = time.perf_counter()
+        if transport.counts_queries:
+            with CaptureQueriesContext(connection) as ctx:
+                status, _body = transport.request(method, path, data, token)
+            queries = len(ctx.captured_queries)
+        else:
+            status, _body = transport.request(method, path, data, token)
+            queries = None
+        return (time.perf_counter() - start) * 1000, status, queries
+
+    for i in range(warmup):
+        one(i)
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(requests)))
+    else:
+        results = [one(i) for i in range(requests)]
+    elapsed = time.perf_counter() - started
+
+    latencies = [r[0] for r in results]
+    statuses = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    queries = [r[2] for r in results if r[2] is not None]
+
+    return {
+        "method": method,
+        "path": path,
+        "requests": requests,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+        "queries_mean": round(statistics.fmean(queries), 2) if queries else None,
+        "queries_max": max(queries) if queries else None,
+    }
+
+
+def compare(current, baseline, threshold_pct):
+    """List endpoints whose p95 or query count regressed beyond the threshold."""
+    regressions = []
+    for name, result in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and result["p95_ms"] > before["p95_ms"] * (1 + threshold_pct / 100):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+        if (before.get("queries_max") is not None and result.get("queries_max") is not None
+                and result["queries_max"] > before["queries_max"]):
+            regressions.append(f"{name}: queries {before['queries_max']} -> {result['queries_max']}")
+    return regressions
+
+
+# ==============================
+# SERIALIZATION
+# ==============================
+def serialization_report(rows=1000, repeats=5):
+    """
+    Time one page of ``rows`` events and donations through each list
+    rendering path and report payload sizes (raw and gzipped). Query time is
+    excluded: every path renders from rows fetched up front.
+    """
+    import gzip
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from .models import Donation
+    from .renderers import ORJSONRenderer
+    from .serializers import DonationSerializer, EventSerializer
+
+    factory = APIRequestFactory()
+
+    def request(params=None):
+        return Request(factory.get("/", params or {}, HTTP_HOST="localhost"))
+
+    def measure(serialize, renderer):
+        serialize_ms, render_ms = [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            data = serialize()
+            serialize_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            body = renderer.render(data)
+            render_ms.append((time.perf_counter() - start) * 1000)
+        return {
+            "serialize_ms": round(statistics.median(serialize_ms), 2),
+            "render_ms": round(statistics.median(render_ms), 2),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body)),
+        }
+
+    report = {}
+    for label, serializer_class, queryset, sparse in (
+        ("events", EventSerializer, Event.objects.order_by("-date", "-id"), "id,title,date"),
+        ("donations", DonationSerializer,
+         Donation.objects.select_related("donor", "event").order_by("-date", "-id"), "id,donor,amount,date"),
+    ):
+        full, narrow = request(), request({"fields": sparse})
+        instances = list(queryset[:rows])
+        values = list(serializer_class(context={"request": full}).values_queryset(queryset)[:rows])
+        narrow_serializer = serializer_class(context={"request": narrow})
+        narrow_values = list(narrow_serializer.values_queryset(queryset)[:rows])
+
+        report[label] = {
+            "rows": len(instances),
+            "model_serializer": measure(
+                lambda: serializer_class(instances, many=True, context={"request": full}).data,
+                JSONRenderer(),
+            ),
+            "values": measure(
+                lambda: serializer_class(context={"request": full}).represent_values(values),
+                JSONRenderer(),
+            ),
+            "values_orjson": measure(
+                lambda: serializer_class(context={"request": full}).represent_values(values),
+                ORJSONRenderer(),
+            ),
+            f"sparse_orjson ({sparse})": measure(
+                lambda: serializer_class(context={"request": narrow}).represent_values(narrow_values),
+                ORJSONRenderer(),
+            ),
+        }
+    return report
@@ -0,0 +1,37 @@
+"""
+Cache backends. Throttle buckets and single-flight calls (core/throttling.py)
+take locks with cache.add(), which has to be atomic across processes.
+"""
+import os
+import tempfile
+
+from django.core.cache.backends import filebased
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """
+    Django's file cache with an atomic add(): the entry is written to a
+    temporary file and hard-linked into place, which fails if the key's file
+    already exists. (The stock add() checks, then sets.)
+    """
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, "wb") as f:
+                self._write_content(f, timeout, value)
+            for _ in range(2):
+                try:
+                    os.link(tmp_path, fname)
+                    return True
+                except FileExistsError:
+                    # An expired entry is deleted by has_key(); try once more.
+                    if self.has_key(key, version):
+                        return False
+            return False
+        finally:
+            os.remove(tmp_path)
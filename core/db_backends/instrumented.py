@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.core.signals import request_started
+from django.db import connections
+
+from .. import metrics
+
+
+_lock = threading.Lock()
+_stats = defaultdict(lambda: {
+    "checkouts": 0,
+    "reuses": 0,
+    "connects": 0,
+    "connect_ms_total": 0.0,
+    "connect_ms_max": 0.0,
+    "waits": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+    "closes": 0,
+    "health_check_failures": 0,
+})
+
+
+def record(alias, **changes):
+    with _lock:
+        stats = _stats[alias]
+        for key, value in changes.items():
+            if key.endswith("_max"):
+                stats[key] = max(stats[key], value)
+            else:
+                stats[key] += value
+
+
+def snapshot():
+    """Per-alias connection stats, plus psycopg_pool's own when pooling."""
+    with _lock:
+        data = {alias: dict(stats) for alias, stats in _stats.items()}
+    for alias, stats in data.items():
+        for name, count in (("connect", "connects"), ("wait", "waits")):
+            stats[f"{name}_ms_total"] = round(stats[f"{name}_ms_total"], 3)
+            stats[f"{name}_ms_max"] = round(stats[f"{name}_ms_max"], 3)
+            stats[f"{name}_ms_avg"] = (
+                round(stats[f"{name}_ms_total"] / stats[count], 3) if stats[count] else 0.0
+            )
+        pool = getattr(connections[alias], "pool", None) if alias in connections else None
+        if pool is not None:
+            stats["pool"] = pool.get_stats()
+    return data
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+metrics.register("db", snapshot)
+
+
+def queued_requests(pool):
+    # psycopg_pool counts the getconn() calls that found no idle connection.
+    return pool.get_stats().get("requests_queued", 0) if pool is not None else 0
+
+
+class InstrumentedDatabaseWrapperMixin:
+    """
+    Counts connection checkouts. Without a pool each one opens a connection
+    (connects, connect_ms_*: the TCP/TLS handshake); with one it is a
+    getconn(), and only those that found the pool empty and blocked count
+    as waits (wait_ms_*). Requests served by an already-open persistent
+    connection are reuses.
+    """
+
+    def connect(self):
+        pool = getattr(self, "pool", None)
+        queued = queued_requests(pool)
+        start = time.perf_counter()
+        super().connect()
+        elapsed = (time.perf_counter() - start) * 1000
+        if pool is None:
+            record(self.alias, checkouts=1, connects=1, connect_ms_total=elapsed, connect_ms_max=elapsed)
+        elif queued_requests(pool) > queued:
+            record(self.alias, checkouts=1, waits=1, wait_ms_total=elapsed, wait_ms_max=elapsed)
+        else:
+            record(self.alias, checkouts=1)
+
+    def close(self):
+        was_open = self.connection is not None
+        super().close()
+        if was_open:
+            record(self.alias, closes=1)
+
+    def close_if_health_check_failed(self):
+        was_open = self.connection is not None
+        super().close_if_health_check_failed()
+        if was_open and self.connection is None:
+            record(self.alias, health_check_failures=1)
+
+
+def count_reuse(connection):
+    if isinstance(connection, InstrumentedDatabaseWrapperMixin) and connection.connection is not None:
+        record(connection.alias, checkouts=1, reuses=1)
+
+
+def count_reuses(**kwargs):
+    # Runs after Django's own close_old_connections() on request_started, so
+    # any connection still open here will serve this request as-is.
+    for connection in connections.all(initialized_only=True):
+        count_reuse(connection)
+
+
+request_started.connect(count_reuses, dispatch_uid="core.db_backends.count_reuses")
@@ -0,0 +1,79 @@
+"""
+Idempotency-Key support for create endpoints. The key row is inserted in
+the same transaction as the write it guards, so a retry either finds the
+stored response or, if the original is still in flight, waits on the
+unique index until it commits (or rolls back) and then decides.
+"""
+import hashlib
+import json
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import metrics
+from .models import IdempotencyKey
+
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request, *args):
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    raw = json.dumps([request.method, request.path, data, args], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def replay(record, fingerprint):
+    if record.fingerprint != fingerprint:
+        return Response(
+            {"detail": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    metrics.incr("idempotency.replayed")
+    response = Response(record.response_body, status=record.response_status)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+class IdempotentCreateMixin:
+    """
+    create() honouring an optional Idempotency-Key header, scoped per user.
+    Only successful responses are stored; a request that fails validation
+    or errors rolls its key back and can be retried with the same key.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user_id = request.user.id
+        fingerprint = request_fingerprint(request, *kwargs.values())
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user_id=user_id, key=key, fingerprint=fingerprint
+                    )
+            except IntegrityError:
+                # Committed by an earlier request (the insert above waited
+                # for it if it was still running).
+                return replay(IdempotencyKey.objects.get(user_id=user_id, key=key), fingerprint)
+
+            response = super().create(request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                record.response_status = response.status_code
+                record.response_body = response.data
+                record.save(update_fields=["response_status", "response_body"])
+            else:
+                transaction.set_rollback(True)
+        return response
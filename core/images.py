@@ -0,0 +1,219 @@
+"""
+Event image pipeline. Uploads are written to local staging storage and the
+event is marked ``image_pending``; `manage.py process_event_images` pushes
+them to the image backend and stores the delivery URL of every variant in
+``Event.image_urls``, so rendering an event never calls the SDK.
+"""
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import metrics
+from .models import Event
+from .response_cache import bump_versions
+
+
+MAX_ATTEMPTS = 5
+# A claim older than this is taken to belong to a worker that died mid-upload.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+# Failed uploads wait RETRY_BACKOFF, doubling per attempt up to MAX_BACKOFF.
+RETRY_BACKOFF = timedelta(seconds=30)
+MAX_BACKOFF = timedelta(hours=1)
+
+# name -> (width, height, crop); "fill" crops to the box, "limit" only shrinks.
+VARIANTS = {
+    "thumbnail": (200, 200, "fill"),
+    "card": (600, None, "limit"),
+    "large": (1200, None, "limit"),
+}
+
+
+# ==============================
+# BACKENDS
+# ==============================
+class CloudinaryImageBackend:
+    """
+    Uploads through the Cloudinary SDK; variants are URL transformations.
+    The SDK (and the requests/urllib3 stack under it) is imported here, on
+    first use, rather than at boot.
+    """
+
+    def __init__(self):
+        import cloudinary
+
+        credentials = settings.CLOUDINARY_STORAGE
+        if credentials.get("CLOUD_NAME"):
+            cloudinary.config(
+                cloud_name=credentials["CLOUD_NAME"],
+                api_key=credentials.get("API_KEY"),
+                api_secret=credentials.get("API_SECRET"),
+            )
+
+    def upload(self, file, public_id):
+        from cloudinary import uploader
+
+        resource = uploader.upload_resource(
+            file, type="upload", resource_type="image", public_id=public_id,
+            folder=settings.CLOUDINARY_STORAGE.get("FOLDER"),
+        )
+        return resource.get_prep_value()
+
+    def urls(self, value):
+        from cloudinary import CloudinaryResource
+        from cloudinary.models import CloudinaryField
+
+        resource = value if isinstance(value, CloudinaryResource) else CloudinaryField().to_python(value)
+        urls = {"original": resource.build_url(secure=True)}
+        for name, (width, height, crop) in VARIANTS.items():
+            options = {"width": width, "crop": crop, "fetch_format": "auto", "quality": "auto"}
+            if height:
+                options["height"] = height
+            urls[name] = resource.build_url(secure=True, **options)
+        return urls
+
+
+class LocalImageBackend:
+    """
+    Filesystem stand-in for Cloudinary (development and tests): stores the
+    original under EVENT_IMAGE_LOCAL_ROOT and renders the variants with
+    Pillow at upload time.
+    """
+
+    def __init__(self):
+        self.storage = FileSystemStorage(
+            location=settings.EVENT_IMAGE_LOCAL_ROOT, base_url=settings.EVENT_IMAGE_LOCAL_URL
+        )
+
+    def upload(self, file, public_id):
+        from PIL import Image, ImageOps
+
+        image = Image.open(file)
+        image.load()
+        fmt = (image.format or "PNG").lower()
+        file.seek(0)
+        name = self.storage.save(f"{public_id}.{fmt}", file)
+
+        for variant, (width, height, crop) in VARIANTS.items():
+            if crop == "fill":
+                resized = ImageOps.fit(image, (width, height))
+            else:
+                resized = image.copy()
+                resized.thumbnail((width, resized.height))
+            with self.storage.open(self.variant_name(name, variant), "wb") as handle:
+                resized.save(handle, format=image.format or "PNG")
+        return name
+
+    def variant_name(self, name, variant):
+        root, ext = os.path.splitext(name)
+        return f"{root}_{variant}{ext}"
+
+    def urls(self, value):
+        name = str(value)
+        urls = {"original": self.storage.url(name)}
+        for variant in VARIANTS:
+            urls[variant] = self.storage.url(self.variant_name(name, variant))
+        return urls
+
+
+_backend = None
+
+
+def get_image_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.EVENT_IMAGE_BACKEND)()
+    return _backend
+
+
+# ==============================
+# STAGING
+# ==============================
+def staging_storage():
+    return FileSystemStorage(location=settings.EVENT_IMAGE_STAGING_ROOT)
+
+
+def stage_upload(upload):
+    """Save an uploaded file to staging; returns its staging name."""
+    ext = os.path.splitext(upload.name or "")[1].lower()
+    return staging_storage().save(f"{uuid.uuid4().hex}{ext}", upload)
+
+
+def discard_staged(name):
+    if name:
+        staging_storage().delete(name)
+
+
+# ==============================
+# WORKER
+# ==============================
+def backoff(attempts):
+    return min(RETRY_BACKOFF * 2 ** (attempts - 1), MAX_BACKOFF)
+
+
+def claimable(now=None):
+    """Pending events that no worker holds and that aren't backing off."""
+    return Event.objects.filter(image_pending=True).filter(
+        Q(image_next_attempt_at=None) | Q(image_next_attempt_at__lte=now or timezone.now())
+    )
+
+
+def process_pending(batch_size=20, max_attempts=MAX_ATTEMPTS):
+    """Upload up to batch_size staged images; returns how many were handled."""
+    ids = list(claimable().order_by("id").values_list("id", flat=True)[:batch_size])
+    for event_id in ids:
+        process_event(event_id, max_attempts)
+    return len(ids)
+
+
+def process_event(event_id, max_attempts=MAX_ATTEMPTS):
+    # Claim the upload with a single UPDATE instead of holding a row lock:
+    # the backend call can take seconds and no transaction is open during
+    # it, so donations (and on SQLite, every writer) carry on meanwhile.
+    now = timezone.now()
+    event = claimable(now).filter(pk=event_id).only("id", "image_staged", "image_attempts").first()
+    if event is None:
+        return
+    staged = event.image_staged
+    # Every write below is keyed on the staged name and this claim, so a
+    # worker that lost its claim, or an upload replaced mid-flight, is a no-op.
+    lease = now + CLAIM_TIMEOUT
+    claimed = Event.objects.filter(pk=event.pk, image_staged=staged, image_next_attempt_at=lease)
+    if not claimable(now).filter(pk=event.pk, image_staged=staged).update(image_next_attempt_at=lease):
+        return
+
+    backend = get_image_backend()
+    try:
+        with staging_storage().open(staged, "rb") as file:
+            value = backend.upload(file, public_id=f"events/{event.id}-{uuid.uuid4().hex[:8]}")
+        urls = backend.urls(value)
+    except Exception as exc:
+        attempts = event.image_attempts + 1
+        claimed.update(
+            image_attempts=attempts,
+            image_error=str(exc)[:1000],
+            image_pending=attempts < max_attempts,
+            image_next_attempt_at=timezone.now() + backoff(attempts),
+        )
+        metrics.incr("images.failed" if attempts >= max_attempts else "images.retried")
+        return
+
+    if not claimed.update(
+        image=value,
+        image_urls=urls,
+        image_pending=False,
+        image_staged="",
+        image_attempts=0,
+        image_error="",
+        image_next_attempt_at=None,
+    ):
+        metrics.incr("images.superseded")
+        return
+    bump_versions(event.pk)
+    discard_staged(staged)
+    metrics.incr("images.uploaded")
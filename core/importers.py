@@ -0,0 +1,236 @@
+import csv
+import json
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from .leaderboards import record_donor_totals
+from .models import Event, Donation, DonationDailyRollup
+from .response_cache import bump_versions
+from .rollups import rollup_day
+from .serializers import DonationSerializer
+
+
+FORMATS = ("csv", "ndjson")
+MAX_REPORTED_ERRORS = 1000
+# Donor map value for a key matching several users (e.g. a shared email).
+AMBIGUOUS = -1
+# Yielded by iter_rows() in place of the first row that isn't valid UTF-8.
+UNDECODABLE = object()
+ARCHIVED = "This event is archived and closed to donations."
+
+
+def guess_format(filename, default="csv"):
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def decode_lines(stream):
+    """The lines of a binary stream as text, decoded one at a time."""
+    for index, line in enumerate(stream):
+        yield line.decode("utf-8-sig" if index == 0 else "utf-8")
+
+
+def iter_rows(stream, fmt):
+    """
+    Yield (row_number, dict) from a binary stream one line at a time, so the
+    file is never held in memory. Row numbers count data rows from 1.
+
+    Lines are decoded as they are read, so bytes that aren't UTF-8 only show
+    up once the rows before them have been yielded (and maybe imported);
+    the row holding them comes out as UNDECODABLE and reading stops there.
+    """
+    lines = decode_lines(stream)
+    number = 0
+    try:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(lines), start=1):
+                yield number, row
+        else:
+            for number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield number, row if isinstance(row, dict) else None
+    except UnicodeDecodeError:
+        yield number + 1, UNDECODABLE
+
+
+# ==============================
+# IMPORTER
+# ==============================
+class DonationImporter:
+    """
+    Validates rows of ``event`` (id), ``donor`` (username or email) and
+    ``amount``, then writes them with one bulk_create per chunk. Each chunk
+    commits on its own, together with its Event counter updates.
+    """
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self.amount_field = DonationSerializer().fields["amount"]
+        self.validate_amount = DonationSerializer().validate_amount
+        # Lookup maps, filled lazily one chunk at a time.
+        self.events = {}
+        self.archived = set()
+        self.donors = {}
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows):
+        chunk = []
+        for number, row in rows:
+            chunk.append((number, row))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def add_error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": number, "errors": errors})
+
+    # ------------------------------
+    # lookups
+    # ------------------------------
+    def load_lookups(self, chunk):
+        event_ids, donor_keys = set(), set()
+        for _, row in chunk:
+            if not isinstance(row, dict):
+                continue
+            event_id = str(row.get("event") or "").strip()
+            if event_id.isdigit() and int(event_id) not in self.events:
+                event_ids.add(int(event_id))
+            donor = str(row.get("donor") or "").strip()
+            if donor and donor not in self.donors:
+                donor_keys.add(donor)
+
+        if event_ids:
+            found = dict(Event.objects.filter(id__in=event_ids).values_list("id", "archived_at"))
+            self.events.update({event_id: event_id in found for event_id in event_ids})
+            self.archived.update(event_id for event_id, archived_at in found.items() if archived_at)
+
+        if donor_keys:
+            matches = defaultdict(set)
+            users = User.objects.filter(
+                Q(username__in=donor_keys) | Q(email__in=donor_keys)
+            ).values_list("id", "username", "email")
+            for user_id, username, email in users:
+                matches[username].add(user_id)
+                if email:
+                    matches[email].add(user_id)
+            for key in donor_keys:
+                ids = matches.get(key)
+                if not ids:
+                    self.donors[key] = None
+                else:
+                    self.donors[key] = ids.pop() if len(ids) == 1 else AMBIGUOUS
+
+    # ------------------------------
+    # validation
+    # ------------------------------
+    def clean(self, row):
+        if row is UNDECODABLE:
+            return None, {"non_field_errors": [
+                "Not valid UTF-8; the file was not read past this row. "
+                "The rows before it were imported."
+            ]}
+        if row is None:
+            return None, {"non_field_errors": ["Row is not a JSON object."]}
+
+        errors = {}
+        event_id = str(row.get("event") or "").strip()
+        if not event_id.isdigit() or not self.events.get(int(event_id)):
+            errors["event"] = ["Event not found."]
+        elif int(event_id) in self.archived:
+            errors["event"] = [ARCHIVED]
+
+        donor_id = self.donors.get(str(row.get("donor") or "").strip())
+        if donor_id is None:
+            errors["donor"] = ["Donor not found."]
+        elif donor_id == AMBIGUOUS:
+            errors["donor"] = ["Donor is ambiguous."]
+
+        try:
+            amount = self.amount_field.run_validation(row.get("amount"))
+            amount = self.validate_amount(amount)
+        except serializers.ValidationError as exc:
+            errors["amount"] = exc.detail
+
+        if errors:
+            return None, errors
+        return Donation(event_id=int(event_id), donor_id=donor_id, amount=amount), None
+
+    # ------------------------------
+    # write
+    # ------------------------------
+    def import_chunk(self, chunk):
+        self.load_lookups(chunk)
+
+        numbered = []
+        for number, row in chunk:
+            donation, errors = self.clean(row)
+            if errors:
+                self.add_error(number, errors)
+            else:
+                numbered.append((number, donation))
+        if not numbered:
+            return
+
+        per_event = defaultdict(lambda: [0, Decimal(0)])
+        for _, donation in numbered:
+            per_event[donation.event_id][0] += 1
+            per_event[donation.event_id][1] += donation.amount
+
+        with transaction.atomic():
+            # The lookups may predate an archive_donations run. The counter
+            # update checks again and waits for a running archive to commit;
+            # an event it no longer matches gets none of this chunk's rows.
+            for event_id, (count, amount) in per_event.items():
+                if Event.objects.filter(pk=event_id, archived_at__isnull=True).add_donations(count, amount):
+                    bump_versions(event_id)
+                else:
+                    self.archived.add(event_id)
+            donations = []
+            for number, donation in numbered:
+                if donation.event_id in self.archived:
+                    self.add_error(number, {"event": [ARCHIVED]})
+                else:
+                    donations.append(donation)
+            if not donations:
+                return
+            Donation.objects.bulk_create(donations, batch_size=self.chunk_size)
+
+            # bulk_create filled in the auto_now_add dates.
+            per_day = defaultdict(lambda: [0, Decimal(0)])
+            for donation in donations:
+                key = (donation.event_id, rollup_day(donation.date))
+                per_day[key][0] += 1
+                per_day[key][1] += donation.amount
+            DonationDailyRollup.objects.add_many(per_day)
+            record_donor_totals(donations)
+
+        self.created += len(donations)
@@ -0,0 +1,105 @@
+"""
+Top-donor leaderboards: one DonorTotal row per (event, donor) and one
+company-wide row per donor, shifted on every donation write, so the top K
+is K rows off an index instead of a GROUP BY over every donation.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import DonationRecord, DonorTotal
+from .ttlcache import TTLCache
+
+
+# Per-process snapshots of the top LEADERBOARD_MAX_SIZE, keyed by event id
+# (None for company-wide). A write clears its own process's entries.
+_snapshots = TTLCache(ttl=settings.LEADERBOARD_CACHE_TTL, maxsize=1_000)
+
+
+def forget(event_ids):
+    def clear():
+        for event_id in {*event_ids, None}:
+            _snapshots.delete(event_id)
+
+    transaction.on_commit(clear)
+
+
+# ==============================
+# WRITES
+# ==============================
+def record_donor_total(donation, count=1):
+    """Add (or with count=-1, remove) one donation from its donor's totals."""
+    amount = count * donation.amount
+    DonorTotal.objects.add(donation.event_id, donation.donor_id, count, amount)
+    DonorTotal.objects.add(None, donation.donor_id, count, amount)
+    forget([donation.event_id])
+
+
+def record_donor_totals(donations):
+    """record_donor_total() for a batch, in a few statements per batch."""
+    totals = defaultdict(lambda: [0, Decimal(0)])
+    for donation in donations:
+        for event_id in (donation.event_id, None):
+            totals[event_id, donation.donor_id][0] += 1
+            totals[event_id, donation.donor_id][1] += donation.amount
+    DonorTotal.objects.add_many(totals)
+    forget([event_id for event_id, _ in totals])
+
+
+def rebuild_event_totals(event_ids):
+    """Recompute the per-event rows of the given events from their donations."""
+    DonorTotal.objects.filter(event_id__in=event_ids).delete()
+    rows = (
+        DonationRecord.objects.filter(event_id__in=event_ids)
+        .values("event_id", "donor_id")
+        .annotate(count=Count("id"), total=Sum("amount"))
+        .order_by()
+    )
+    forget(event_ids)
+    return DonorTotal.objects.bulk_create(DonorTotal(**row) for row in rows)
+
+
+def rebuild_global_totals(donor_ids):
+    """Recompute the company-wide rows of the given donors."""
+    DonorTotal.objects.filter(event__isnull=True, donor_id__in=donor_ids).delete()
+    rows = (
+        DonationRecord.objects.filter(donor_id__in=donor_ids)
+        .values("donor_id")
+        .annotate(count=Count("id"), total=Sum("amount"))
+        .order_by()
+    )
+    forget([])
+    return DonorTotal.objects.bulk_create(DonorTotal(**row) for row in rows)
+
+
+# ==============================
+# READS
+# ==============================
+def top_donors(event_id=None, limit=10):
+    """
+    [{"rank", "donor_id", "donor", "count", "total"}] for the ``limit``
+    biggest donors to one event, or to every event for event_id=None. Ties
+    rank by donor id.
+    """
+    rows = (
+        DonorTotal.objects.filter(event_id=event_id, count__gt=0)
+        .order_by("-total", "donor_id")
+        .values_list("donor_id", "donor__username", "count", "total")[:limit]
+    )
+    return [
+        {"rank": rank, "donor_id": donor_id, "donor": username, "count": count, "total": total}
+        for rank, (donor_id, username, count, total) in enumerate(rows, start=1)
+    ]
+
+
+def leaderboard(event_id=None, limit=10):
+    """top_donors() served from the per-process snapshot when enabled."""
+    if settings.LEADERBOARD_CACHE_TTL <= 0:
+        return top_donors(event_id, limit)
+    board = _snapshots.get_or_set(
+        event_id, lambda: top_donors(event_id, settings.LEADERBOARD_MAX_SIZE)
+    )
+    return board[:limit]
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import metrics
+from .models import OutboundEmail
+
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+# How long a claimed batch stays invisible to other workers.
+CLAIM_SECONDS = 5 * 60
+
+
+# ==============================
+# ENQUEUE
+# ==============================
+def queue_donation_receipt(donation, user):
+    if not user.email:
+        return
+
+    event_title = donation.event.title
+    message = OutboundEmail(
+        to=user.email,
+        subject=f"Donation Successful - {event_title}",
+        body=(
+            f"Hello {user.username},\n\n"
+            f"Thank you for donating ₹{donation.amount} to '{event_title}'.\n"
+            f"Your donation has been successfully recorded.\n\n"
+            f"Regards,\nEvent Management Team"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+    )
+    transaction.on_commit(message.save)
+
+
+# ==============================
+# DELIVERY
+# ==============================
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def claim_batch(batch_size):
+    """
+    Lock a batch of due messages and push their next_attempt_at forward so
+    concurrent workers skip them while this one is sending.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[m.pk for m in batch]).update(
+            next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS)
+        )
+    return batch
+
+
+def deliver_pending(batch_size=100, max_attempts=MAX_ATTEMPTS):
+    """
+    Send one batch over a single SMTP connection. Failures are retried with
+    exponential backoff and dead-lettered after ``max_attempts``. Returns the
+    number of messages processed.
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        for message in batch:
+            record_failure(message, exc, max_attempts)
+        return len(batch)
+
+    try:
+        for message in batch:
+            email = EmailMessage(
+                message.subject, message.body, message.from_email, [message.to],
+                connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as exc:
+                record_failure(message, exc, max_attempts)
+                # The server may have dropped us; reconnect for the rest.
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+                continue
+
+            message.status = OutboundEmail.SENT
+            message.attempts += 1
+            message.sent_at = timezone.now()
+            message.last_error = ""
+            message.save(update_fields=["status", "attempts", "sent_at", "last_error"])
+            metrics.incr("mail.sent")
+    finally:
+        connection.close()
+
+    return len(batch)
+
+
+def record_failure(message, exc, max_attempts):
+    message.attempts += 1
+    message.last_error = f"{type(exc).__name__}: {exc}"
+    if message.attempts >= max_attempts:
+        message.status = OutboundEmail.DEAD
+        metrics.incr("mail.dead")
+    else:
+        message.next_attempt_at = timezone.now() + backoff(message.attempts)
+        metrics.incr("mail.retried")
+    message.save(update_fields=["status", "attempts", "last_error", "next_attempt_at"])
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import localdate
+
+from core.archive import archive_event
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = "Move the donations of events that ended long enough ago into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than", type=int, default=30,
+            help="Archive events dated more than this many days ago (0: every completed event).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Donations per copy/delete batch.")
+        parser.add_argument("--dry-run", action="store_true", help="List the events without moving anything.")
+
+    def handle(self, *args, older_than, batch_size, dry_run, **options):
+        cutoff = localdate() - timedelta(days=older_than)
+        events = (
+            Event.objects.filter(date__lt=cutoff, archived_at__isnull=True)
+            .order_by("date", "id")
+            .values_list("id", "donation_count")
+        )
+
+        archived = moved = 0
+        for event_id, count in list(events):
+            if dry_run:
+                self.stdout.write(f"Event {event_id}: {count} donations")
+                archived += 1
+                moved += count
+                continue
+            result = archive_event(event_id, batch_size)
+            if result is not None:
+                archived += 1
+                moved += result
+
+        verb = "Would archive" if dry_run else "Archived"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {moved} donations from {archived} events dated before {cutoff}."
+        ))
@@ -0,0 +1,31 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import FORMATS, DonationImporter, guess_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-import donations from a CSV or NDJSON file (columns: event, donor, amount)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, path, format, chunk_size, **options):
+        fmt = format or guess_format(path)
+        try:
+            stream = open(path, "rb")
+        except OSError as exc:
+            raise CommandError(exc)
+
+        with stream:
+            report = DonationImporter(chunk_size=chunk_size).run(iter_rows(stream, fmt))
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        style = self.style.WARNING if report["failed"] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"Imported {report['created']} donations, {report['failed']} rows failed."
+        ))
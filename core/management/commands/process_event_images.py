@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.images import MAX_ATTEMPTS, get_image_backend, process_pending
+from core.models import Event
+from core.response_cache import bump_versions
+
+
+class Command(BaseCommand):
+    help = "Push staged event images to the image backend and cache their variant URLs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when no images are pending.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no images are pending instead of polling.",
+        )
+        parser.add_argument(
+            "--refresh-urls",
+            action="store_true",
+            help="Recompute image_urls for every event with an uploaded image, then exit.",
+        )
+
+    def handle(self, *args, batch_size, max_attempts, interval, once, refresh_urls, **options):
+        if refresh_urls:
+            return self.refresh_urls(batch_size)
+
+        total = 0
+        while True:
+            processed = process_pending(batch_size=batch_size, max_attempts=max_attempts)
+            total += processed
+            if processed:
+                self.stdout.write(f"Processed {processed} images.")
+                continue
+            if once:
+                break
+            time.sleep(interval)
+            # Drop connections that went stale or outlived CONN_MAX_AGE while idle.
+            close_old_connections()
+
+        self.stdout.write(self.style.SUCCESS(f"No images pending, {total} processed."))
+
+    def refresh_urls(self, batch_size):
+        backend = get_image_backend()
+        events = Event.objects.exclude(image=None).exclude(image="").only("id", "image")
+        refreshed = 0
+        for event in events.iterator(chunk_size=batch_size):
+            Event.objects.filter(pk=event.pk).update(image_urls=backend.urls(event.image))
+            bump_versions(event.pk)
+            refreshed += 1
+        self.stdout.write(self.style.SUCCESS(f"Refreshed image URLs for {refreshed} events."))
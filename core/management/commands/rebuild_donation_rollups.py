@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Event
+from core.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild DonationDailyRollup rows from the donations table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=200, help="Events per transaction.")
+        parser.add_argument("--event", type=int, action="append", help="Only rebuild these event ids.")
+
+    def handle(self, *args, chunk_size, event, **options):
+        events = Event.objects.order_by("id")
+        if event:
+            events = events.filter(id__in=event)
+
+        rebuilt = rows = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                # Locking the events holds off donation writes (which update
+                # the same rows' counters) while their rollups are replaced.
+                ids = list(
+                    events.select_for_update().filter(id__gt=last_id)
+                    .values_list("id", flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                last_id = ids[-1]
+                rows += len(rebuild_rollups(ids))
+            rebuilt += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} daily rollups for {rebuilt} events."
+        ))
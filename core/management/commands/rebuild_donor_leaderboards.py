@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.leaderboards import rebuild_event_totals, rebuild_global_totals
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the per-event and company-wide DonorTotal leaderboard rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=200, help="Events or donors per transaction.")
+
+    def handle(self, *args, chunk_size, **options):
+        events = rows = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                # Locking the events holds off donation writes (which update
+                # the same rows' counters) while their totals are replaced.
+                ids = list(
+                    Event.objects.select_for_update().filter(id__gt=last_id).order_by("id")
+                    .values_list("id", flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                last_id = ids[-1]
+                rows += len(rebuild_event_totals(ids))
+            events += len(ids)
+
+        # Company-wide rows span every event, so no lock covers them; a
+        # donation landing mid-chunk can be off until the next rebuild.
+        donors = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    User.objects.filter(id__gt=last_id).order_by("id")
+                    .values_list("id", flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                last_id = ids[-1]
+                rows += len(rebuild_global_totals(ids))
+            donors += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} donor totals for {events} events and {donors} donors."
+        ))
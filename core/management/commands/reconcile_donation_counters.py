@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from core.models import Event, Donation
+from core.response_cache import bump_versions
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.donation_count/donation_total from donations and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing corrected counters.",
+        )
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        checked = drifted = 0
+        last_id = 0
+
+        while True:
+            with transaction.atomic():
+                events = list(
+                    Event.objects.select_for_update()
+                    # Archived events' counters are final (core.archive).
+                    .filter(id__gt=last_id, archived_at__isnull=True)
+                    .order_by("id")
+                    .only("id", "donation_count", "donation_total")[:chunk_size]
+                )
+                if not events:
+                    break
+                last_id = events[-1].id
+
+                actual = {
+                    row["event_id"]: row
+                    for row in Donation.objects.filter(event__in=events)
+                    .values("event_id")
+                    .annotate(count=Count("id"), total=Sum("amount"))
+                    .order_by()
+                }
+
+                stale = []
+                for event in events:
+                    row = actual.get(event.id, {})
+                    count, total = row.get("count", 0), row.get("total") or 0
+                    if event.donation_count != count or event.donation_total != total:
+                        self.stdout.write(self.style.WARNING(
+                            f"Event {event.id}: count {event.donation_count} -> {count}, "
+                            f"total {event.donation_total} -> {total}"
+                        ))
+                        event.donation_count, event.donation_total = count, total
+                        stale.append(event)
+
+                if stale and not dry_run:
+                    Event.objects.bulk_update(stale, ["donation_count", "donation_total"])
+                    for event in stale:
+                        bump_versions(event.id)
+
+            checked += len(events)
+            drifted += len(stale)
+
+        verb = "found" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} events, {verb} {drifted} with drifted counters."
+        ))
@@ -0,0 +1,104 @@
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from core.bench import HTTPTransport, InProcessTransport, build_scenarios, compare, run_scenario
+from core.management.commands.seed_bench import BENCH_ADMIN, BENCH_PASSWORD, USER_PREFIX
+
+
+class Command(BaseCommand):
+    help = "Benchmark every API route and report latency percentiles, throughput and query counts as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Benchmark a running server (gunicorn gentle_backend.wsgi, or uvicorn "
+                "gentle_backend.asgi for the async_* endpoints) instead of in-process. "
+                "Raise its THROTTLE_*_RATE settings first or the heavy endpoints get 429s."
+            ),
+        )
+        parser.add_argument("--only", nargs="+", help="Endpoint names to run.")
+        parser.add_argument("--cold-cache", action="store_true", help="Clear the cache before every request.")
+        parser.add_argument("--username", default=f"{USER_PREFIX}0")
+        parser.add_argument("--admin-username", default=BENCH_ADMIN)
+        parser.add_argument("--password", default=BENCH_PASSWORD)
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument("--compare", help="Baseline JSON report to check for regressions.")
+        parser.add_argument("--threshold", type=float, default=20.0, help="Allowed p95 regression in percent.")
+
+    def handle(self, *args, **options):
+        if options["base_url"]:
+            self.benchmark(HTTPTransport(options["base_url"]), options)
+            return
+
+        if options["concurrency"] > 1:
+            raise CommandError("--concurrency needs --base-url; the in-process client is sequential.")
+        # Measure the endpoints, not the per-user token buckets.
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}):
+            self.benchmark(InProcessTransport(), options)
+
+    def benchmark(self, transport, options):
+        try:
+            scenarios = build_scenarios(
+                transport, options["username"], options["password"], options["admin_username"]
+            )
+        except RuntimeError as exc:
+            raise CommandError(exc)
+
+        names = options["only"] or list(scenarios)
+        unknown = set(names) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": self.git_revision(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "cache": settings.CACHES["default"]["BACKEND"],
+            "target": options["base_url"] or "in-process",
+            "endpoints": {},
+        }
+        for name in names:
+            report["endpoints"][name] = run_scenario(
+                transport,
+                scenarios[name],
+                options["requests"],
+                warmup=options["warmup"],
+                concurrency=options["concurrency"],
+                cold_cache=options["cold_cache"],
+            )
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+        self.stdout.write(output)
+
+        if options["compare"]:
+            with open(options["compare"]) as handle:
+                regressions = compare(report, json.load(handle), options["threshold"])
+            for line in regressions:
+                self.stderr.write(self.style.ERROR(f"Regression: {line}"))
+            if regressions:
+                sys.exit(1)
+
+    def git_revision(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True, text=True, cwd=settings.BASE_DIR,
+            ).stdout.strip() or None
+        except OSError:
+            return None
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.mail import MAX_ATTEMPTS, deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Drain the OutboundEmail outbox in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no due messages are left instead of polling.",
+        )
+
+    def handle(self, *args, batch_size, max_attempts, interval, once, **options):
+        total = 0
+        while True:
+            processed = deliver_pending(batch_size=batch_size, max_attempts=max_attempts)
+            total += processed
+            if processed:
+                self.stdout.write(f"Processed {processed} messages.")
+                continue
+            if once:
+                break
+            time.sleep(interval)
+            # Drop connections that went stale or outlived CONN_MAX_AGE while idle.
+            close_old_connections()
+
+        self.stdout.write(self.style.SUCCESS(f"Outbox drained, {total} messages processed."))
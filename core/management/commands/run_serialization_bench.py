@@ -0,0 +1,19 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.bench import serialization_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list rendering paths (ModelSerializer, values() fast path, orjson, "
+        "sparse fieldsets) on one page of events and donations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeats", type=int, default=5)
+
+    def handle(self, *args, rows, repeats, **options):
+        self.stdout.write(json.dumps(serialization_report(rows, repeats), indent=2))
@@ -0,0 +1,156 @@
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils.timezone import localdate, make_aware
+
+from core.leaderboards import rebuild_event_totals, rebuild_global_totals
+from core.models import ArchivedDonation, Event, Donation, DonationRecord
+from core.response_cache import bump_versions
+from core.rollups import rebuild_rollups
+from core.search import get_search_backend
+
+
+BENCH_PASSWORD = "bench-pass"
+BENCH_ADMIN = "bench_admin"
+USER_PREFIX = "bench_user_"
+EVENT_PREFIX = "[bench] "
+
+WORDS = (
+    "blood", "donation", "camp", "beach", "cleanup", "marathon", "charity",
+    "food", "drive", "tree", "planting", "school", "books", "health", "relief",
+    "flood", "winter", "clothes", "animal", "shelter", "literacy", "walk",
+)
+CITIES = ("Kochi", "Bengaluru", "Chennai", "Pune", "Hyderabad", "Mumbai", None)
+# Donations are spread over the days leading up to their event (or today).
+DONATION_DAYS = 90
+
+
+class Command(BaseCommand):
+    help = "Deterministically generate users, events and donations for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--events", type=int, default=2000)
+        parser.add_argument("--donations", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete previously seeded bench data first.",
+        )
+
+    def handle(self, *args, users, events, donations, seed, batch_size, clear, **options):
+        rng = random.Random(seed)
+
+        if clear:
+            self.clear()
+        elif User.objects.filter(username=BENCH_ADMIN).exists():
+            raise CommandError("Bench data already exists; pass --clear to reseed.")
+
+        password = make_password(BENCH_PASSWORD)
+
+        with transaction.atomic():
+            User.objects.create(
+                username=BENCH_ADMIN, email="bench_admin@example.com", password=password,
+                is_staff=True, is_superuser=True,
+            )
+            user_objs = User.objects.bulk_create([
+                User(username=f"{USER_PREFIX}{i}", email=f"{USER_PREFIX}{i}@example.com",
+                     password=password)
+                for i in range(users)
+            ], batch_size=batch_size)
+
+            today = localdate()
+            event_objs = Event.objects.bulk_create([
+                Event(
+                    title=EVENT_PREFIX + " ".join(rng.sample(WORDS, 3)).title(),
+                    description=" ".join(rng.choices(WORDS, k=rng.randint(20, 120))),
+                    date=today + timedelta(days=rng.randint(-365, 90)),
+                    location=rng.choice(CITIES),
+                )
+                for _ in range(events)
+            ], batch_size=batch_size)
+            backend = get_search_backend()
+            for event in event_objs:
+                backend.index(event)
+
+            counters = defaultdict(lambda: [0, Decimal(0)])
+            batch = []
+            for i in range(donations):
+                event = rng.choice(event_objs)
+                amount = Decimal(rng.randint(100, 500000)) / 100
+                counters[event.id][0] += 1
+                counters[event.id][1] += amount
+                day = min(event.date, today) - timedelta(days=rng.randint(0, DONATION_DAYS))
+                date = make_aware(datetime.combine(day, datetime.min.time())) + timedelta(
+                    seconds=rng.randrange(24 * 60 * 60)
+                )
+                batch.append((Donation(event=event, donor=rng.choice(user_objs), amount=amount), date))
+                if len(batch) >= batch_size or i == donations - 1:
+                    self.insert(batch)
+                    batch = []
+
+            for event in event_objs:
+                event.donation_count, event.donation_total = counters[event.id]
+            Event.objects.bulk_update(
+                event_objs, ["donation_count", "donation_total"], batch_size=batch_size
+            )
+            rebuild_rollups([event.id for event in event_objs])
+            rebuild_event_totals([event.id for event in event_objs])
+            rebuild_global_totals([user.id for user in user_objs])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {users} users, {events} events and {donations} donations "
+            f"(seed {seed}). Log in as {BENCH_ADMIN} or {USER_PREFIX}0 / {BENCH_PASSWORD}."
+        ))
+
+    def insert(self, batch):
+        # auto_now_add overwrites the date on insert, so it is set afterwards.
+        created = Donation.objects.bulk_create([donation for donation, _ in batch])
+        for donation, (_, date) in zip(created, batch):
+            donation.date = date
+        Donation.objects.bulk_update(created, ["date"], batch_size=1000)
+
+    def clear(self):
+        """
+        Remove the bench users and events. Their donations are deleted
+        first, through the usual post_delete signals; the counters, rollups
+        and donor totals of anything that survives (another user's donation
+        to a bench event, say) are then rebuilt from the donations left.
+        """
+        events = Event.objects.filter(title__startswith=EVENT_PREFIX)
+        donors = User.objects.filter(Q(username__startswith=USER_PREFIX) | Q(username=BENCH_ADMIN))
+        touched_events, touched_donors = set(), set()
+
+        with transaction.atomic():
+            for model in (Donation, ArchivedDonation):
+                rows = model.objects.filter(Q(event__in=events) | Q(donor__in=donors))
+                for event_id, donor_id in rows.values_list("event_id", "donor_id").distinct():
+                    touched_events.add(event_id)
+                    touched_donors.add(donor_id)
+                rows.delete()
+            events.delete()
+            donors.delete()
+
+            event_ids = list(Event.objects.filter(id__in=touched_events).values_list("id", flat=True))
+            donor_ids = list(User.objects.filter(id__in=touched_donors).values_list("id", flat=True))
+            totals = {
+                row["event_id"]: (row["count"], row["total"])
+                for row in DonationRecord.objects.filter(event_id__in=event_ids)
+                .values("event_id").annotate(count=Count("id"), total=Sum("amount")).order_by()
+            }
+            for event_id in event_ids:
+                count, total = totals.get(event_id, (0, 0))
+                Event.objects.filter(pk=event_id).update(donation_count=count, donation_total=total)
+                bump_versions(event_id)
+            rebuild_rollups(event_ids)
+            rebuild_event_totals(event_ids)
+            rebuild_global_totals(donor_ids)
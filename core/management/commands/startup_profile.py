@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import startup_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot the project in a fresh interpreter under -X importtime and report time per "
+        "phase (settings, app registry, middleware, URLconf), per app ready() and per "
+        "imported package, as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--asgi", action="store_true", help="Load the ASGI handler instead of WSGI.")
+        parser.add_argument(
+            "--warm-up", action="store_true",
+            help="Also run the gunicorn warm-up (URL resolver, serializers, DB connections).",
+        )
+        parser.add_argument("--top", type=int, default=20, help="Packages and modules to list.")
+        parser.add_argument("--runs", type=int, default=1, help="Boots to run; the median one is reported.")
+
+    def handle(self, *args, **options):
+        try:
+            report = startup_report(
+                interface="asgi" if options["asgi"] else "wsgi",
+                warm=options["warm_up"],
+                top=options["top"],
+                runs=max(options["runs"], 1),
+            )
+        except RuntimeError as exc:
+            raise CommandError(f"Boot failed: {exc}")
+        self.stdout.write(json.dumps(report, indent=2))
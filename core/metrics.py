@@ -0,0 +1,31 @@
+import threading
+from collections import defaultdict
+
+
+# Per-process counters; each worker reports its own numbers.
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_collectors = {}
+
+
+def incr(name, amount=1):
+    with _lock:
+        _counters[name] += amount
+
+
+def register(name, collector):
+    """Add a callable whose dict result is reported under ``name``."""
+    _collectors[name] = collector
+
+
+def snapshot():
+    with _lock:
+        data = dict(sorted(_counters.items()))
+    for name, collector in _collectors.items():
+        data[name] = collector()
+    return data
+
+
+def reset():
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,221 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics, routers
+from .profiling import RequestProfile, normalize_params, normalize_sql, profiling
+
+
+logger = logging.getLogger("core.profiling")
+
+
+def mark_async_capable(middleware):
+    """
+    For middleware with both __call__ and __acall__ (sync_capable and
+    async_capable), at the end of __init__, as Django's MiddlewareMixin
+    does: under ASGI Django hands it an async get_response, and marking the
+    instance makes Django await it rather than run the request through the
+    one thread-sensitive sync thread.
+    """
+    if iscoroutinefunction(middleware.get_response):
+        markcoroutinefunction(middleware)
+
+
+def wrap_connections(profile):
+    # Connections are per thread: under ASGI this has to run in the thread
+    # the request's ORM calls use (sync_to_async's thread-sensitive one).
+    for alias in connections:
+        connections[alias].execute_wrappers.append(profile)
+
+
+def unwrap_connections(profile):
+    for alias in connections:
+        connections[alias].execute_wrappers.remove(profile)
+
+
+class RequestProfilingMiddleware:
+    """
+    Times each request (DB via connection execute wrappers, serializers via
+    core.profiling.span) and reports it as a Server-Timing header plus one
+    structured log line. Flags slow requests, slow queries and repeated
+    queries from one call site (N+1).
+
+    Streaming bodies are produced after this returns, so their queries are
+    not included.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        mark_async_capable(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REQUEST_PROFILING:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        start = time.perf_counter()
+        with profiling(profile):
+            wrap_connections(profile)
+            try:
+                response = self.get_response(request)
+            finally:
+                unwrap_connections(profile)
+        self.report(request, response, profile, start)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_PROFILING:
+            return await self.get_response(request)
+
+        profile = RequestProfile()
+        start = time.perf_counter()
+        with profiling(profile):
+            await sync_to_async(wrap_connections)(profile)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(unwrap_connections)(profile)
+        self.report(request, response, profile, start)
+        return response
+
+    def report(self, request, response, profile, start):
+        total_ms = (time.perf_counter() - start) * 1000
+
+        serializer_ms = profile.spans.get("serializer", 0.0)
+        view_ms = max(total_ms - profile.db_ms - serializer_ms, 0.0)
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={profile.db_ms:.1f};desc="{len(profile.queries)} queries"',
+            f"serializer;dur={serializer_ms:.1f}",
+            f"view;dur={view_ms:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ])
+
+        self.log(request, response, profile, total_ms, serializer_ms, view_ms)
+
+    def log(self, request, response, profile, total_ms, serializer_ms, view_ms):
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": len(profile.queries),
+            "db_ms": round(profile.db_ms, 1),
+            "serializer_ms": round(serializer_ms, 1),
+            "view_ms": round(view_ms, 1),
+            "total_ms": round(total_ms, 1),
+        }
+        logger.info(json.dumps(record))
+
+        for query in profile.slow_queries(settings.SLOW_QUERY_MS):
+            metrics.incr("profiling.slow_queries")
+            logger.warning(json.dumps({
+                "event": "slow_query",
+                "path": request.path,
+                "ms": round(query["ms"], 1),
+                "sql": normalize_sql(query["sql"]),
+                "params": normalize_params(query["params"]),
+                "call_site": query["call_site"],
+            }))
+
+        for duplicate in profile.duplicates(settings.DUPLICATE_QUERY_THRESHOLD):
+            metrics.incr("profiling.duplicate_queries")
+            logger.warning(json.dumps({"event": "duplicate_queries", "path": request.path, **duplicate}))
+
+        if total_ms >= settings.SLOW_REQUEST_MS:
+            metrics.incr("profiling.slow_requests")
+            slowest = sorted(profile.queries, key=lambda q: q["ms"], reverse=True)[:5]
+            logger.warning(json.dumps({
+                "event": "slow_request",
+                **record,
+                "slowest_queries": [
+                    {"ms": round(q["ms"], 1), "sql": normalize_sql(q["sql"]),
+                     "params": normalize_params(q["params"]), "call_site": q["call_site"]}
+                    for q in slowest
+                ],
+            }))
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves bodies under GZIP_MIN_BYTES alone: small JSON
+    responses gain little and still pay the compression CPU.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.GZIP_MIN_BYTES:
+            return response
+        return super().process_response(request, response)
+
+
+class ReplicaMiddleware:
+    """
+    Gives each request the routing state core.routers.ReplicaRouter reads,
+    and pins a user to the primary for REPLICA_PIN_SECONDS after a request
+    of theirs wrote, so their next reads see it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        mark_async_capable(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routers.request_state() as state:
+            response = self.get_response(request)
+        if state.wrote:
+            self.pin(request)
+        return response
+
+    async def __acall__(self, request):
+        with routers.request_state() as state:
+            response = await self.get_response(request)
+        if state.wrote:
+            # May load a lazy session user; off the event loop.
+            await sync_to_async(self.pin)(request)
+        return response
+
+    def pin(self, request):
+        # DRF stores the user it authenticated back on the HttpRequest.
+        user = getattr(request, "user", None)
+        if settings.REPLICA_DATABASES and user and user.is_authenticated:
+            routers.pin_user(user.pk)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that can also run async, so under ASGI the requests
+    it passes through stay on the event loop. Matched files are still
+    served from a thread (file I/O).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        mark_async_capable(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
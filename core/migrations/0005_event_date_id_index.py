@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_event_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', '-id'], name='core_event_date_id_idx'),
+        ),
+    ]
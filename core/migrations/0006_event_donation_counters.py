@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    Donation = apps.get_model('core', 'Donation')
+    per_event = Donation.objects.filter(event=OuterRef('pk')).order_by().values('event')
+    Event.objects.update(
+        donation_count=Coalesce(
+            Subquery(per_event.annotate(c=Count('id')).values('c')), 0,
+            output_field=models.PositiveIntegerField(),
+        ),
+        donation_total=Coalesce(
+            Subquery(per_event.annotate(s=Sum('amount')).values('s')), 0,
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_event_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='donation_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='donation_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE core_event_fts USING fts5(title, description, location)",
+    "INSERT INTO core_event_fts (rowid, title, description, location) "
+    "SELECT id, title, description, COALESCE(location, '') FROM core_event",
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS core_event_fts",
+]
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE core_event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', COALESCE(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', COALESCE(location, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX core_event_search_vector_idx ON core_event USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS core_event_search_vector_idx",
+    "ALTER TABLE core_event DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def sqlite_has_fts5(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        # Some builds ship FTS5 as a loadable default without the flag.
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp._fts5_probe")
+        except Exception:
+            return False
+        return True
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor == 'sqlite' and not sqlite_has_fts5(schema_editor):
+            return
+        for statement in statements_by_vendor.get(vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text index for event search (see core/search.py). The index lives
+    outside the Django model state: an FTS5 table on SQLite, a generated
+    tsvector column + GIN index on PostgreSQL, nothing elsewhere.
+    """
+
+    dependencies = [
+        ('core', '0006_event_donation_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_event_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['event', '-date', '-id'], name='core_donation_event_date_idx'),
+        ),
+    ]
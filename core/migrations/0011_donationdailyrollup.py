@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Donation = apps.get_model('core', 'Donation')
+    DonationDailyRollup = apps.get_model('core', 'DonationDailyRollup')
+    rows = (
+        Donation.objects.annotate(day=TruncDate('date'))
+        .values('event_id', 'day')
+        .annotate(count=Count('id'), total=Sum('amount'))
+        .order_by()
+    )
+    DonationDailyRollup.objects.bulk_create(
+        (DonationDailyRollup(**row) for row in rows.iterator(chunk_size=2000)),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_usertokenversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='core.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='core_rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'day'), name='core_rollup_event_day_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
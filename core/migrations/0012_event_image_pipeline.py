@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_donationdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_staged',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_urls',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
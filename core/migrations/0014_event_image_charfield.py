@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='image',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='image'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_event_image_charfield'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['-date', '-id'], name='core_donation_date_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_donation_donor_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donor_totals', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='donor_totals', to='core.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', '-total', 'donor'], name='core_donortotal_rank_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('event__isnull', False)), fields=('event', 'donor'), name='core_donortotal_event_donor_uniq'), models.UniqueConstraint(condition=models.Q(('event__isnull', True)), fields=('donor',), name='core_donortotal_global_donor_uniq')],
+            },
+        ),
+    ]
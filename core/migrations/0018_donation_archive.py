@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Cold table for completed events' donations (see `manage.py
+    archive_donations`) and the core_donation_all view DonationRecord reads.
+    """
+
+    dependencies = [
+        ('core', '0017_donortotal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedDonation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date', models.DateTimeField()),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_donations', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_donations', to='core.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', '-date', '-id'], name='core_archived_event_date_idx'), models.Index(fields=['donor', '-date', '-id'], name='core_archived_donor_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DonationRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'core_donation_all',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql=[
+                "CREATE VIEW core_donation_all AS "
+                "SELECT id, event_id, donor_id, amount, date FROM core_donation "
+                "UNION ALL "
+                "SELECT id, event_id, donor_id, amount, date FROM core_archiveddonation",
+            ],
+            reverse_sql=["DROP VIEW core_donation_all"],
+        ),
+    ]
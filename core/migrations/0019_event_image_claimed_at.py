@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_donation_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
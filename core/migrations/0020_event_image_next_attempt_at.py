@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_event_image_claimed_at'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='event',
+            old_name='image_claimed_at',
+            new_name='image_next_attempt_at',
+        ),
+    ]
@@ -1,7 +1,19 @@
-# models.py
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import F, Q
 from django.contrib.auth.models import User
-from cloudinary.models import CloudinaryField
+from django.utils import timezone
+
+
+class EventQuerySet(models.QuerySet):
+    def add_donations(self, count, amount):
+        """
+        Shift the denormalized donation counters in a single UPDATE. The
+        F-expressions keep concurrent donations to the same event correct.
+        """
+        return self.update(
+            donation_count=F("donation_count") + count,
+            donation_total=F("donation_total") + amount,
+        )
 
 
 class Event(models.Model):
@@ -9,7 +21,35 @@ class Event(models.Model):
     description = models.TextField()
     date = models.DateField()
     location = models.CharField(max_length=200, blank=True, null=True)
-    image = CloudinaryField("image", blank=True, null=True)
+    # The Cloudinary resource path ("image/upload/v1/events/1.png"), kept as
+    # a plain string so importing the models doesn't load the Cloudinary SDK;
+    # core.images turns it into URLs.
+    image = models.CharField("image", max_length=255, blank=True, null=True)
+    # Async upload pipeline (core.images): the upload waits in staging until
+    # `manage.py process_event_images` pushes it and caches the variant URLs.
+    image_pending = models.BooleanField(default=False)
+    image_staged = models.CharField(max_length=255, blank=True)
+    image_urls = models.JSONField(default=dict, blank=True)
+    image_attempts = models.PositiveSmallIntegerField(default=0)
+    image_error = models.TextField(blank=True)
+    # No worker takes the staged upload before this: the lease of the worker
+    # uploading it, or the backoff after a failed attempt (core.images).
+    image_next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    # Maintained on write; see DonationSerializer.create and core.signals.
+    donation_count = models.PositiveIntegerField(default=0)
+    donation_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Set by `manage.py archive_donations` once the donations have moved to
+    # ArchivedDonation; the counters above are then final.
+    archived_at = models.DateTimeField(blank=True, null=True)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Newest-first listings and keyset pagination on (date, id).
+            models.Index(fields=["-date", "-id"], name="core_event_date_id_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -21,5 +61,268 @@ class Donation(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Per-event listing, newest first, keyset-paginated on (date, id).
+            models.Index(fields=["event", "-date", "-id"], name="core_donation_event_date_idx"),
+            # All-events listings (admin changelist, date hierarchy, exports).
+            models.Index(fields=["-date", "-id"], name="core_donation_date_idx"),
+            # A donor's history across events, keyset-paginated on (date, id).
+            models.Index(fields=["donor", "-date", "-id"], name="core_donation_donor_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.donor.username} - {self.amount}"
+
+
+class ArchivedDonation(models.Model):
+    """
+    A completed event's donation, moved out of core_donation by
+    `manage.py archive_donations` with its id and date unchanged.
+    """
+    event = models.ForeignKey(Event, related_name="archived_donations", on_delete=models.CASCADE)
+    donor = models.ForeignKey(User, related_name="archived_donations", on_delete=models.CASCADE)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    date = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["event", "-date", "-id"], name="core_archived_event_date_idx"),
+            models.Index(fields=["donor", "-date", "-id"], name="core_archived_donor_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.donor_id} - {self.amount}"
+
+
+class DonationRecord(models.Model):
+    """
+    Read-only: every donation, hot or archived, through the core_donation_all
+    view (core_donation UNION ALL core_archiveddonation). Filters are pushed
+    into both branches, so each still uses its own indexes. A migration that
+    alters the columns of either table has to recreate the view.
+    """
+    event = models.ForeignKey(Event, related_name="+", on_delete=models.DO_NOTHING)
+    donor = models.ForeignKey(User, related_name="+", on_delete=models.DO_NOTHING)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    date = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "core_donation_all"
+
+    def __str__(self):
+        return f"{self.donor_id} - {self.amount}"
+
+
+class CounterQuerySet(models.QuerySet):
+    """Rows keyed on key_fields that hold a running ``count`` and ``total``."""
+    key_fields = ()
+    # Rows per statement; four parameters each stays under SQLite's 999.
+    batch_size = 200
+
+    def conflict_target(self, key, quote):
+        """The ON CONFLICT target of the unique constraint ``key`` falls under."""
+        return f"({', '.join(quote(name) for name in self.key_fields)})"
+
+    def add_many(self, deltas):
+        """
+        add() for a batch: ``deltas`` maps key tuples (in key_fields order)
+        to (count, amount). Each batch is one INSERT ... ON CONFLICT DO
+        UPDATE (both SQLite and PostgreSQL have it), so new and existing
+        rows take the same statement and a concurrent creator loses nothing.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        columns = [*self.key_fields, "count", "total"]
+        fields = [self.model._meta.get_field(name) for name in columns]
+
+        by_target = {}
+        for key, (count, amount) in deltas.items():
+            values = (*key, count, amount)
+            row = [field.get_db_prep_save(value, connection) for field, value in zip(fields, values)]
+            by_target.setdefault(self.conflict_target(key, quote), []).append(row)
+
+        count_column, total_column = quote("count"), quote("total")
+        with connection.cursor() as cursor:
+            for target, rows in by_target.items():
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(batch))
+                    cursor.execute(
+                        f"INSERT INTO {table} ({', '.join(quote(name) for name in columns)}) "
+                        f"VALUES {placeholders} ON CONFLICT {target} DO UPDATE SET "
+                        f"{count_column} = {table}.{count_column} + excluded.{count_column}, "
+                        f"{total_column} = {table}.{total_column} + excluded.{total_column}",
+                        [value for row in batch for value in row],
+                    )
+
+
+class DonationDailyRollupQuerySet(CounterQuerySet):
+    key_fields = ("event_id", "day")
+
+    def add(self, event_id, day, count, amount):
+        """
+        Shift one (event, day) bucket, creating it on first use. The insert
+        runs in a savepoint so a concurrent creator just means we update.
+        """
+        changes = {"count": F("count") + count, "total": F("total") + amount}
+        if self.filter(event_id=event_id, day=day).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                self.create(event_id=event_id, day=day, count=count, total=amount)
+        except IntegrityError:
+            self.filter(event_id=event_id, day=day).update(**changes)
+
+
+class DonationDailyRollup(models.Model):
+    """
+    Donations per event per day, maintained on write alongside the Event
+    counters (see core.rollups). Rebuild with `manage.py rebuild_donation_rollups`.
+    """
+    event = models.ForeignKey(Event, related_name="daily_rollups", on_delete=models.CASCADE)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    objects = DonationDailyRollupQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "day"], name="core_rollup_event_day_uniq"),
+        ]
+        indexes = [
+            # Range scans for the all-events series.
+            models.Index(fields=["day"], name="core_rollup_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} {self.day}: {self.count} / {self.total}"
+
+
+class DonorTotalQuerySet(CounterQuerySet):
+    key_fields = ("event_id", "donor_id")
+
+    def conflict_target(self, key, quote):
+        # One partial unique constraint per kind of row; see DonorTotal.Meta.
+        if key[0] is None:
+            return f"({quote('donor_id')}) WHERE {quote('event_id')} IS NULL"
+        return f"({quote('event_id')}, {quote('donor_id')}) WHERE {quote('event_id')} IS NOT NULL"
+
+    def add(self, event_id, donor_id, count, amount):
+        """
+        Shift one donor's (event or, with event_id=None, company-wide) total,
+        creating the row on first use, like DonationDailyRollupQuerySet.add.
+        """
+        changes = {"count": F("count") + count, "total": F("total") + amount}
+        if self.filter(event_id=event_id, donor_id=donor_id).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                self.create(event_id=event_id, donor_id=donor_id, count=count, total=amount)
+        except IntegrityError:
+            self.filter(event_id=event_id, donor_id=donor_id).update(**changes)
+
+
+class DonorTotal(models.Model):
+    """
+    A donor's donations to one event, or to every event when ``event`` is
+    null, maintained on write (see core.leaderboards). Rebuild with
+    `manage.py rebuild_donor_leaderboards`.
+    """
+    event = models.ForeignKey(
+        Event, related_name="donor_totals", on_delete=models.CASCADE, null=True, blank=True
+    )
+    donor = models.ForeignKey(User, related_name="donor_totals", on_delete=models.CASCADE)
+    count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = DonorTotalQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "donor"], condition=Q(event__isnull=False),
+                name="core_donortotal_event_donor_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["donor"], condition=Q(event__isnull=True),
+                name="core_donortotal_global_donor_uniq",
+            ),
+        ]
+        indexes = [
+            # Top-K for one event (or event IS NULL) is a K-row index scan.
+            models.Index(fields=["event", "-total", "donor"], name="core_donortotal_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id or 'all'} {self.donor_id}: {self.count} / {self.total}"
+
+
+class OutboundEmail(models.Model):
+    """Outbox row drained by `manage.py run_mail_worker`."""
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (DEAD, "Dead"),
+    ]
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="core_outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to} - {self.subject}"
+
+
+class UserTokenVersion(models.Model):
+    """Bumped to revoke every JWT issued to the user (see core.auth)."""
+    user = models.OneToOneField(
+        User, primary_key=True, related_name="token_version", on_delete=models.CASCADE
+    )
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client's Idempotency-Key for one write. The row commits together with
+    the write it guards, so a replay finds either nothing or the stored
+    response (see core.idempotency).
+    """
+    user = models.ForeignKey(User, related_name="idempotency_keys", on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="core_idempotency_user_key_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="core_idempotency_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.key}"
@@ -0,0 +1,191 @@
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+# ==============================
+# KEYSET (CURSOR) HELPERS
+# ==============================
+def encode_cursor(values):
+    """Pack the ordering values of the last row into an opaque token."""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor(); raises NotFound for tampered tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError):
+        raise NotFound("Invalid cursor")
+    if not isinstance(values, list):
+        raise NotFound("Invalid cursor")
+    return values
+
+
+def cursor_values(token, model, fields):
+    """
+    decode_cursor() for an ordering on ``fields`` of ``model``: one value
+    per field, each cleaned by its model field, so a tampered token is a
+    404 rather than a database error.
+    """
+    values = decode_cursor(token)
+    if len(values) != len(fields):
+        raise NotFound("Invalid cursor")
+    try:
+        return [model._meta.get_field(field).clean(value, None) for field, value in zip(fields, values)]
+    except (ValidationError, TypeError, ValueError):
+        raise NotFound("Invalid cursor")
+
+
+def keyset_filter(fields, values):
+    """
+    Rows strictly after ``values`` for a descending ordering on ``fields``:
+    (a < x) OR (a = x AND b < y) OR ...
+    """
+    condition = Q()
+    for i, field in enumerate(fields):
+        step = Q(**{f"{field}__lt": values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_field: prev_value})
+        condition |= step
+    return condition
+
+
+# ==============================
+# KEYSET PAGINATION
+# ==============================
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a strictly descending, unique ``ordering``. Unlike
+    DRF's CursorPagination (position + offset), the cursor carries every
+    ordering value, so each page is one index range scan with no OFFSET and
+    no COUNT(*).
+    """
+    ordering = ("-id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = None
+    cursor_query_param = "cursor"
+
+    def get_fields(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() through the async ORM."""
+        queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """The next page_size + 1 rows; the extra row tells whether there is a next page."""
+        self.request = request
+        self.limit = self.get_page_size(request)
+        fields = self.get_fields()
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = cursor_values(cursor, queryset.model, fields)
+            queryset = queryset.filter(keyset_filter(fields, values))
+        return queryset[:self.limit + 1]
+
+    def finish_page(self, rows):
+        self.has_next = len(rows) > self.limit
+        rows = rows[:self.limit]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = rows[-1]
+            self.next_cursor = encode_cursor([self.get_value(last, field) for field in self.get_fields()])
+        return rows
+
+    def get_value(self, row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+# ==============================
+# ESTIMATED COUNT (ADMIN)
+# ==============================
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists over big tables. An unfiltered queryset
+    is counted from the planner statistics (pg_class.reltuples) instead of
+    a COUNT(*) that reads the whole table. Filtered querysets, tables under
+    ``exact_below`` rows and other databases get the exact count. The
+    estimate can be slightly off, so the last page may be short or empty.
+    """
+    exact_below = 10_000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate()
+        if estimate is None or estimate < self.exact_below:
+            return super().count
+        return estimate
+
+    def estimate(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or queryset.query.where:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1 until the table has been vacuumed or analyzed.
+        return int(row[0]) if row and row[0] >= 0 else None
@@ -0,0 +1,120 @@
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+_current = ContextVar("request_profile", default=None)
+
+_PLACEHOLDER_RE = re.compile(r"%s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(sql):
+    """Replace literals/placeholders with ? and collapse IN lists, for grouping."""
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    return _IN_LIST_RE.sub("(...)", sql)
+
+
+def normalize_params(params):
+    """Parameter types only, so logs never carry user data."""
+    if not params:
+        return []
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+def call_site():
+    """First frame in project code outside Django/DRF and this module."""
+    base = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(base) and "site-packages" not in filename
+                and not filename.endswith(("profiling.py", "middleware.py"))):
+            return f"{filename[len(base) + 1:]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+# ==============================
+# PER-REQUEST PROFILE
+# ==============================
+class RequestProfile:
+    def __init__(self):
+        self.queries = []
+        self.db_ms = 0.0
+        self.spans = defaultdict(float)
+        self._open = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.db_ms += duration
+            self.queries.append({
+                "sql": sql,
+                "params": params,
+                "ms": duration,
+                "call_site": call_site(),
+            })
+
+    @contextmanager
+    def span(self, name):
+        # Nested spans of the same name (nested serializers) count once.
+        if name in self._open:
+            yield
+            return
+        self._open.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] += (time.perf_counter() - start) * 1000
+            self._open.discard(name)
+
+    def slow_queries(self, threshold_ms):
+        return [query for query in self.queries if query["ms"] >= threshold_ms]
+
+    def duplicates(self, threshold):
+        """
+        Same normalized statement issued ``threshold``+ times from one call
+        site: the signature of an N+1 loop.
+        """
+        counts = Counter((normalize_sql(q["sql"]), q["call_site"]) for q in self.queries)
+        return [
+            {"sql": sql, "call_site": site, "count": count}
+            for (sql, site), count in counts.most_common()
+            if count >= threshold
+        ]
+
+
+def current_profile():
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    profile = _current.get()
+    if profile is None:
+        yield
+    else:
+        with profile.span(name):
+            yield
+
+
+@contextmanager
+def profiling(profile):
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional; ORJSONRenderer falls back to the stdlib encoder
+    orjson = None
+
+
+class ExportJSONEncoder(JSONEncoder):
+    """Keeps decimals exact (as strings) in exported rows."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+# ==============================
+# API RENDERER
+# ==============================
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson. Types orjson doesn't handle natively (and
+    dates/times, so their format matches) go through DRF's JSONEncoder, so
+    the output is the same document, just produced several times faster.
+    """
+    encoder = JSONEncoder()
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        options = self.options
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self.encoder.default, option=options)
+        # Same escaping as JSONRenderer: keeps the output valid JavaScript.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+# ==============================
+# STREAMING EXPORT RENDERERS
+# ==============================
+class CSVRenderer(BaseRenderer):
+    """
+    Export views stream rows themselves through write_rows(); render() only
+    handles non-streamed responses such as errors.
+    """
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def write_rows(self, columns, rows, batch_size=1000):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for i, row in enumerate(rows, start=1):
+            writer.writerow([self.cell(row[column]) for column in columns])
+            if i % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def cell(self, value):
+        if value is None:
+            return ""
+        if hasattr(value, "isoformat"):
+            return ExportJSONEncoder().default(value)
+        return value
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        columns = list(rows[0]) if rows else []
+        return "".join(self.write_rows(columns, rows)).encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def write_rows(self, columns, rows, batch_size=1000):
+        encoder = ExportJSONEncoder()
+        lines = []
+        for row in rows:
+            lines.append(encoder.encode({column: row[column] for column in columns}))
+            if len(lines) >= batch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return "".join(
+            json.dumps(row, cls=ExportJSONEncoder) + "\n" for row in rows
+        ).encode(self.charset)
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import metrics
+from .routers import current_replica
+
+
+GLOBAL_VERSION_KEY = "events:version"
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def event_version_key(event_id):
+    return f"events:{event_id}:version"
+
+
+# ==============================
+# VERSION COUNTERS
+# ==============================
+def get_versions(keys):
+    """
+    Current version token for each key. Tokens are random rather than
+    incremented so concurrent bumps can never collide on a value.
+    """
+    cache = get_cache()
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(event_id=None):
+    """
+    Invalidate the event list (and one event's detail) once the current
+    transaction commits, so a reader can't cache pre-commit data under the
+    new version.
+    """
+    keys = [GLOBAL_VERSION_KEY]
+    if event_id is not None:
+        keys.append(event_version_key(event_id))
+
+    def bump():
+        get_cache().set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+    transaction.on_commit(bump)
+
+
+# ==============================
+# KEYS AND ENTRIES
+# ==============================
+def response_cache_key(request, versions):
+    raw = json.dumps([
+        request.scheme,
+        request.get_host(),
+        request.path,
+        sorted(request.GET.lists()),
+        versions,
+    ])
+    return "response:" + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def make_entry(data):
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True)
+    return {
+        "data": data,
+        "etag": '"%s"' % hashlib.sha1(body.encode()).hexdigest(),
+    }
+
+
+def is_not_modified(request, entry):
+    # Weak comparison: GZipMiddleware turns the ETag into W/"..." on the way out.
+    etags = [etag.removeprefix("W/") for etag in parse_etags(request.headers.get("If-None-Match", ""))]
+    return entry["etag"] in etags or etags == ["*"]
+
+
+async def aget_versions(keys):
+    """get_versions() for async views."""
+    cache = get_cache()
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, uuid.uuid4().hex, None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+# ==============================
+# VIEW MIXIN
+# ==============================
+class CachedResponseMixin:
+    """
+    Serve GET from the response cache, keyed on host, path, query string and
+    the version counters returned by get_cache_version_keys(). Responses carry
+    a strong ETag; a matching If-None-Match gets an empty 304.
+    """
+
+    def get_cache_version_keys(self):
+        return [GLOBAL_VERSION_KEY]
+
+    def get_cache_key(self, request):
+        return response_cache_key(request, get_versions(self.get_cache_version_keys()))
+
+    def get_cache_timeout(self):
+        # A replica can still be behind the write that bumped the version;
+        # keep what it returned no longer than that write pins its author.
+        if current_replica() is not None:
+            return min(settings.RESPONSE_CACHE_TIMEOUT, settings.REPLICA_PIN_SECONDS)
+        return settings.RESPONSE_CACHE_TIMEOUT
+
+    def get(self, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+
+        if entry is None:
+            metrics.incr("response_cache.miss")
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            entry = make_entry(response.data)
+            cache.set(key, entry, self.get_cache_timeout())
+        else:
+            metrics.incr("response_cache.hit")
+
+        if is_not_modified(request, entry):
+            metrics.incr("response_cache.not_modified")
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry["data"])
+        response["ETag"] = entry["etag"]
+        return response
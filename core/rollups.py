@@ -0,0 +1,88 @@
+"""
+Daily donation rollups: one DonationDailyRollup row per (event, day),
+shifted on every donation write, so a time series costs one row per day in
+range instead of one per donation.
+"""
+from datetime import date, timedelta
+
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import DonationDailyRollup, DonationRecord
+
+
+GRANULARITIES = ("day", "week", "month")
+TRUNCATE = {"week": TruncWeek, "month": TruncMonth}
+
+
+def rollup_day(value):
+    """The rollup day of a Donation.date, in the current time zone."""
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def record_donation(donation, count=1):
+    """Add (or with count=-1, remove) one donation from its day's rollup."""
+    DonationDailyRollup.objects.add(
+        donation.event_id, rollup_day(donation.date), count, count * donation.amount
+    )
+
+
+def rebuild_rollups(event_ids):
+    """Recompute the rollups of the given events from their donations."""
+    DonationDailyRollup.objects.filter(event_id__in=event_ids).delete()
+    rows = (
+        DonationRecord.objects.filter(event_id__in=event_ids)
+        .annotate(day=TruncDate("date"))
+        .values("event_id", "day")
+        .annotate(count=Count("id"), total=Sum("amount"))
+        .order_by()
+    )
+    return DonationDailyRollup.objects.bulk_create(DonationDailyRollup(**row) for row in rows)
+
+
+# ==============================
+# TIME SERIES
+# ==============================
+def bucket_start(day, granularity):
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, granularity):
+    if granularity == "week":
+        return day + timedelta(days=7)
+    if granularity == "month":
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(days=1)
+
+
+def timeseries(start, end, granularity="day", event_id=None):
+    """
+    Zero-filled [{"bucket", "count", "total"}] for every bucket touching
+    start..end (inclusive). One aggregate query over the rollup rows; weeks
+    start on Monday.
+    """
+    qs = DonationDailyRollup.objects.filter(day__gte=start, day__lte=end)
+    if event_id is not None:
+        qs = qs.filter(event_id=event_id)
+
+    truncate = TRUNCATE.get(granularity)
+    bucket = truncate("day") if truncate else F("day")
+    rows = qs.values(bucket=bucket).annotate(count=Sum("count"), total=Sum("total")).order_by()
+    found = {row["bucket"]: row for row in rows}
+
+    series = []
+    bucket = bucket_start(start, granularity)
+    while bucket <= end:
+        row = found.get(bucket, {})
+        series.append({
+            "bucket": bucket,
+            "count": row.get("count", 0),
+            "total": row.get("total") or 0,
+        })
+        bucket = next_bucket(bucket, granularity)
+    return series
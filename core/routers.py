@@ -0,0 +1,120 @@
+"""
+Read-replica routing. Each request gets a RequestState from
+ReplicaMiddleware; views that opt in with ReplicaReadMixin point their GET
+reads at one replica from REPLICA_DATABASES. Reads still go to "default"
+inside transaction.atomic(), once the request has written, and for users
+pinned there by a write in the last REPLICA_PIN_SECONDS (read-your-writes).
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from . import metrics
+
+
+class RequestState:
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+_state = ContextVar("replica_state", default=None)
+
+
+@contextmanager
+def request_state():
+    state = RequestState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def current_replica():
+    """The replica this request reads from, or None for the primary."""
+    state = _state.get()
+    if state is None or state.wrote:
+        return None
+    return state.replica
+
+
+# ==============================
+# PINS
+# ==============================
+# Kept in the shared cache rather than in the process: the write and the
+# read that must see it are often served by different workers.
+def pin_key(user_id):
+    return f"replica:pin:{user_id}"
+
+
+def pin_user(user_id):
+    caches[settings.REPLICA_PIN_CACHE_ALIAS].set(pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return bool(caches[settings.REPLICA_PIN_CACHE_ALIAS].get(pin_key(user_id)))
+
+
+# ==============================
+# ROUTER
+# ==============================
+def is_cache_table(model):
+    # DatabaseCache entries (throttle buckets, response cache) are not data.
+    return model._meta.app_label == "django_cache"
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = current_replica()
+        if replica is None or is_cache_table(model):
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and not is_cache_table(model):
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema by replication, not by migrate.
+        return db not in settings.REPLICA_DATABASES
+
+
+# ==============================
+# VIEW MIXIN
+# ==============================
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests from a replica. The choice is made after
+    authentication, so the user's pin can be checked (auth reads stay on
+    the primary). Streaming bodies run after the request and read the
+    primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = _state.get()
+        replicas = settings.REPLICA_DATABASES
+        if state is None or not replicas or request.method not in SAFE_METHODS:
+            return
+        user = request.user
+        if user and user.is_authenticated and is_pinned(user.pk):
+            metrics.incr("replica.pinned")
+            return
+        state.replica = random.choice(replicas)
+        metrics.incr("replica.reads")
@@ -0,0 +1,158 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+
+SEARCH_FIELDS = ("title", "description", "location")
+WORD_RE = re.compile(r"\w+")
+
+
+def search_words(term):
+    return WORD_RE.findall(term.lower())
+
+
+# ==============================
+# BACKENDS
+# ==============================
+class IContainsSearchBackend:
+    """Portable fallback: every word must icontains-match one of the fields."""
+
+    def search(self, queryset, term, fields=SEARCH_FIELDS, rank=False):
+        words = search_words(term)
+        if not words:
+            return queryset
+        return queryset.filter(reduce(and_, (
+            reduce(or_, (Q(**{f"{field}__icontains": word}) for field in fields))
+            for word in words
+        )))
+
+    def index(self, event):
+        pass
+
+    def remove(self, event_id):
+        pass
+
+
+class SQLiteFTSSearchBackend(IContainsSearchBackend):
+    """
+    FTS5 table ``core_event_fts`` (rowid = event id), kept in sync from the
+    Event save/delete signals. Triggers are not used because SQLite table
+    rebuilds in later migrations would silently drop them.
+    """
+    table = "core_event_fts"
+    # bm25() column weights, in FTS table column order.
+    weights = (10.0, 1.0, 2.0)
+
+    def match_expression(self, words, fields):
+        phrases = " ".join(f'"{word}"*' for word in words)
+        return f"{{{' '.join(fields)}}} : ({phrases})"
+
+    def search(self, queryset, term, fields=SEARCH_FIELDS, rank=False):
+        words = search_words(term)
+        if not words:
+            return queryset
+        match = self.match_expression(words, fields)
+
+        queryset = queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match]
+        ))
+        if rank:
+            # bm25() is lower-is-better.
+            weights = ", ".join(str(w) for w in self.weights)
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"SELECT bm25({self.table}, {weights}) FROM {self.table} "
+                f"WHERE {self.table} MATCH %s AND rowid = {queryset.model._meta.db_table}.id",
+                [match],
+                output_field=FloatField(),
+            )).order_by("search_rank", *queryset.query.order_by)
+        return queryset
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [event.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, description, location) "
+                "VALUES (%s, %s, %s, %s)",
+                [event.pk, event.title, event.description, event.location or ""],
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [event_id])
+
+
+class PostgresSearchBackend(IContainsSearchBackend):
+    """
+    Generated ``core_event.search_vector`` tsvector column (title weighted A,
+    description B, location C) behind a GIN index. PostgreSQL maintains the
+    column itself, so index()/remove() have nothing to do.
+    """
+    weights = {"title": "A", "description": "B", "location": "C"}
+
+    def tsquery(self, words, fields):
+        weights = "".join(self.weights[field] for field in fields)
+        return " & ".join(f"{word}:*{weights}" for word in words)
+
+    def search(self, queryset, term, fields=SEARCH_FIELDS, rank=False):
+        words = search_words(term)
+        if not words:
+            return queryset
+        tsquery = self.tsquery(words, fields)
+        table = queryset.model._meta.db_table
+
+        queryset = queryset.filter(RawSQL(
+            f"{table}.search_vector @@ to_tsquery('simple', %s)",
+            [tsquery],
+            output_field=BooleanField(),
+        ))
+        if rank:
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"ts_rank({table}.search_vector, to_tsquery('simple', %s))",
+                [tsquery],
+                output_field=FloatField(),
+            )).order_by("-search_rank", *queryset.query.order_by)
+        return queryset
+
+
+_backend = None
+
+
+def get_search_backend():
+    """
+    EVENT_SEARCH_BACKEND (dotted path) wins; otherwise pick by database
+    vendor, falling back to icontains when the index is missing.
+    """
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "EVENT_SEARCH_BACKEND", None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == "postgresql":
+            _backend = PostgresSearchBackend()
+        elif (connection.vendor == "sqlite"
+              and SQLiteFTSSearchBackend.table in connection.introspection.table_names()):
+            _backend = SQLiteFTSSearchBackend()
+        else:
+            _backend = IContainsSearchBackend()
+    return _backend
+
+
+# ==============================
+# DRF FILTER
+# ==============================
+class EventSearchFilter(SearchFilter):
+    """SearchFilter that delegates ?search= to the configured backend, ranked."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        fields = getattr(view, "search_fields", SEARCH_FIELDS)
+        return get_search_backend().search(queryset, " ".join(terms), fields=fields, rank=True)
@@ -1,13 +1,105 @@
-from django.db import models
+from datetime import timedelta
+from functools import partial
+
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils.timezone import localdate
+from .auth import db_user
+from .images import discard_staged, get_image_backend, stage_upload
+from .leaderboards import record_donor_total
 from .models import Event, Donation
+from .profiling import span
+from .rollups import GRANULARITIES, record_donation
+
+
+class ProfiledSerializerMixin:
+    """Counts to_representation() time towards the request's serializer timing."""
+
+    def to_representation(self, instance):
+        with span("serializer"):
+            return super().to_representation(instance)
+
+
+def split_param(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields=a,b renders only those fields and ?omit=a,b drops them, on reads
+    only. Unknown names are ignored.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD"):
+            return fields
+
+        params = getattr(request, "query_params", request.GET)
+        if params.get("fields"):
+            keep = set(split_param(params["fields"]))
+            fields = {name: field for name, field in fields.items() if name in keep}
+        for name in split_param(params.get("omit", "")):
+            fields.pop(name, None)
+        return fields
+
+
+class ValuesListMixin:
+    """
+    List fast path: values_queryset() selects only the columns the (possibly
+    sparse) field set reads, and represent_values() renders those dicts with
+    each field's own to_representation(), skipping model instances and
+    attribute traversal.
+
+    Fields computed from other columns are listed in ``values_columns``
+    (field name -> columns) and rendered by a ``values_<field>(row)`` method.
+    """
+    values_columns = {}
+
+    def get_values_plan(self):
+        columns, plan = [], []
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in self.values_columns:
+                columns.extend(self.values_columns[name])
+                plan.append((name, None, getattr(self, f"values_{name}")))
+                continue
+            column = field.source.replace(".", "__")
+            columns.append(column)
+            # values() already yields the pk for a relation.
+            convert = None if isinstance(field, serializers.PrimaryKeyRelatedField) else field.to_representation
+            plan.append((name, column, convert))
+        return columns, plan
+
+    def values_queryset(self, queryset, extra=()):
+        """``extra``: columns the caller needs too (e.g. cursor ordering)."""
+        columns, _ = self.get_values_plan()
+        return queryset.values(*dict.fromkeys([*columns, *extra]))
+
+    def represent_values(self, rows):
+        _, plan = self.get_values_plan()
+        with span("serializer"):
+            data = []
+            for row in rows:
+                item = {}
+                for name, column, convert in plan:
+                    if column is None:
+                        item[name] = convert(row)
+                    else:
+                        value = row[column]
+                        item[name] = value if value is None or convert is None else convert(value)
+                data.append(item)
+            return data
 
 
 # ============================
 # USER SERIALIZER (same)
 # ============================
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, ProfiledSerializerMixin, serializers.ModelSerializer):
     role = serializers.SerializerMethodField()
 
     class Meta:
@@ -26,9 +118,34 @@ class UserSerializer(serializers.ModelSerializer):
 # ============================
 # EVENT SERIALIZER (same)
 # ============================
-class EventSerializer(serializers.ModelSerializer):
+class StagedImageField(serializers.ImageField):
+    """
+    Accepts an upload like ImageField; renders the event's cached delivery
+    URL instead of asking the storage SDK for one.
+    """
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, event):
+        return self.url_for(event.image_urls, event.image)
+
+    def url_for(self, image_urls, image):
+        url = image_urls.get("original")
+        if url is None and image:
+            # Rows uploaded before URLs were cached (process_event_images
+            # --refresh-urls fills them in).
+            url = get_image_backend().urls(image)["original"]
+        request = self.context.get("request")
+        if url and url.startswith("/") and request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class EventSerializer(SparseFieldsetMixin, ValuesListMixin, ProfiledSerializerMixin,
+                      serializers.ModelSerializer):
     total_donations = serializers.SerializerMethodField()
-    image = serializers.ImageField(use_url=True)
+    image = StagedImageField()
 
     class Meta:
         model = Event
@@ -39,18 +156,60 @@ class EventSerializer(serializers.ModelSerializer):
             "date",
             "location",
             "image",
+            "image_urls",
+            "image_pending",
             "total_donations",
         ]
+        read_only_fields = ["image_urls", "image_pending"]
+
+    values_columns = {
+        "image": ["image_urls", "image"],
+        "total_donations": ["donation_total"],
+    }
 
     def get_total_donations(self, obj):
-        total = obj.donations.aggregate(total=models.Sum("amount"))["total"]
-        return total or 0
+        return obj.donation_total or 0
+
+    def values_image(self, row):
+        return self.fields["image"].url_for(row["image_urls"], row["image"])
+
+    def values_total_donations(self, row):
+        return row["donation_total"] or 0
+
+    def stage_image(self, validated_data, instance=None):
+        # The upload itself happens in `manage.py process_event_images`.
+        upload = validated_data.pop("image", None)
+        if upload is None:
+            return
+        if instance is not None and instance.image_staged:
+            transaction.on_commit(partial(discard_staged, instance.image_staged))
+        validated_data.update(
+            image_staged=stage_upload(upload),
+            image_pending=True,
+            image_attempts=0,
+            image_error="",
+            image_next_attempt_at=None,
+        )
+
+    def create(self, validated_data):
+        self.stage_image(validated_data)
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        self.stage_image(validated_data, instance)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Only the submitted columns: a full save would write back stale
+        # donation counters and image URLs maintained elsewhere.
+        instance.save(update_fields=list(validated_data))
+        return instance
 
 
 # ============================
 # DONATION SERIALIZER
 # ============================
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(SparseFieldsetMixin, ValuesListMixin, ProfiledSerializerMixin,
+                         serializers.ModelSerializer):
     donor = serializers.ReadOnlyField(source="donor.username")
     donor_email = serializers.ReadOnlyField(source="donor.email")
     event_title = serializers.ReadOnlyField(source="event.title")
@@ -77,7 +236,55 @@ class DonationSerializer(serializers.ModelSerializer):
         request = self.context["request"]
         event = self.context["event"]
 
-        validated_data["donor"] = request.user
+        validated_data["donor"] = db_user(request.user)
         validated_data["event"] = event
 
-        return Donation.objects.create(**validated_data)
+        # Runs inside the view's transaction.atomic() block, so the insert,
+        # the counters, the daily rollup and the donor totals commit together.
+        donation = Donation.objects.create(**validated_data)
+        # Checked on the counter update itself, which waits for a running
+        # archive_donations to commit, so nothing lands after the freeze.
+        if not Event.objects.filter(pk=event.pk, archived_at__isnull=True).add_donations(1, donation.amount):
+            raise serializers.ValidationError({"event": ["This event is archived and closed to donations."]})
+        record_donation(donation)
+        record_donor_total(donation)
+        return donation
+
+
+# ============================
+# LEADERBOARD QUERY PARAMS
+# ============================
+class LeaderboardQuerySerializer(serializers.Serializer):
+    """?limit= for the top-donor leaderboards."""
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=settings.LEADERBOARD_MAX_SIZE)
+
+
+# ============================
+# EXPORT QUERY PARAMS
+# ============================
+class DonationExportQuerySerializer(serializers.Serializer):
+    """?event= for the donation export (?search= goes to SearchFilter)."""
+    event = serializers.IntegerField(required=False, min_value=1)
+
+
+# ============================
+# TIME SERIES QUERY PARAMS
+# ============================
+class TimeseriesQuerySerializer(serializers.Serializer):
+    """?granularity=&start=&end=&event= for the donation time series."""
+    DEFAULT_DAYS = 30
+    MAX_DAYS = 3660
+
+    granularity = serializers.ChoiceField(choices=GRANULARITIES, default="day")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    event = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        attrs.setdefault("end", localdate())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=self.DEFAULT_DAYS - 1))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"start": "Must not be after end."})
+        if (attrs["end"] - attrs["start"]).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({"start": f"Ranges are limited to {self.MAX_DAYS} days."})
+        return attrs
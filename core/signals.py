@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import images, search
+from .auth import revoke_tokens
+from .leaderboards import record_donor_total
+from .models import ArchivedDonation, Event, Donation
+from .response_cache import bump_versions
+from .rollups import record_donation
+
+
+@receiver(post_save, sender=Donation)
+def donation_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        bump_versions(instance.event_id)
+
+
+@receiver(post_delete, sender=Donation)
+def donation_deleted(sender, instance, **kwargs):
+    # Also fires for cascades (event/user deletes) and queryset deletes.
+    Event.objects.filter(pk=instance.event_id).add_donations(-1, -instance.amount)
+    record_donation(instance, count=-1)
+    record_donor_total(instance, count=-1)
+    bump_versions(instance.event_id)
+
+
+@receiver(post_delete, sender=ArchivedDonation)
+def archived_donation_deleted(sender, instance, **kwargs):
+    # Cascades from event/user deletes. The event's counters and rollups
+    # are frozen; only the donor totals still count the donation.
+    record_donor_total(instance, count=-1)
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.get_search_backend().index(instance)
+        bump_versions(instance.pk)
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    search.get_search_backend().remove(instance.pk)
+    if instance.image_staged:
+        transaction.on_commit(lambda: images.discard_staged(instance.image_staged))
+    bump_versions(instance.pk)
+
+
+@receiver(setting_changed)
+def search_backend_changed(setting, **kwargs):
+    if setting == "EVENT_SEARCH_BACKEND":
+        search._backend = None
+    elif setting in ("EVENT_IMAGE_BACKEND", "EVENT_IMAGE_LOCAL_ROOT"):
+        images._backend = None
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Role, status or password may have changed; login bookkeeping hasn't.
+    if created or raw or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    revoke_tokens(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        revoke_tokens(instance.pk)
+    else:
+        for user_id in pk_set or ():
+            revoke_tokens(user_id)
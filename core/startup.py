@@ -0,0 +1,205 @@
+"""
+Worker cold start: what booting costs (`manage.py startup_profile`) and
+warming a worker up before it takes traffic (gunicorn.conf.py).
+
+Only the standard library is imported at module level, so the profile can
+time Django's own imports.
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+# ==============================
+# WARM-UP
+# ==============================
+def warm_up(*, code=True, database=True):
+    """
+    Do the work a worker's first request would otherwise pay for; returns
+    {step: ms}. The ``code`` steps are safe before fork (gunicorn preload),
+    ``database`` opens connections and belongs in the worker.
+    """
+    timings = {}
+    if code:
+        start = time.perf_counter()
+        from django.urls import get_resolver
+
+        resolver = get_resolver()
+        resolver.reverse_dict  # imports every view and fills the reverse lookup
+        timings["urls"] = _ms(start)
+
+        start = time.perf_counter()
+        for serializer_class in view_serializers(resolver):
+            serializer = serializer_class()
+            serializer.fields  # model field introspection and the field mapping
+            if hasattr(serializer, "get_values_plan"):
+                serializer.get_values_plan()
+        timings["serializers"] = _ms(start)
+
+    if database:
+        start = time.perf_counter()
+        from django.db import connections
+
+        from .search import get_search_backend
+
+        for connection in connections.all():
+            connection.ensure_connection()
+        get_search_backend()
+        timings["database"] = _ms(start)
+    return timings
+
+
+def view_serializers(resolver):
+    """serializer_class of every routed DRF view, once each."""
+    found = {}
+    patterns = list(resolver.url_patterns)
+    while patterns:
+        pattern = patterns.pop()
+        if hasattr(pattern, "url_patterns"):
+            patterns.extend(pattern.url_patterns)
+            continue
+        view = getattr(pattern.callback, "cls", None)
+        serializer_class = getattr(view, "serializer_class", None)
+        if serializer_class is not None:
+            found[serializer_class] = None
+    return list(found)
+
+
+# ==============================
+# BOOT PROFILE
+# ==============================
+def profile_boot(interface="wsgi", warm=False):
+    """
+    Boot Django the way a server would and time each phase. Meant for a
+    fresh interpreter; the parent collects `-X importtime` from stderr.
+    """
+    phases, app_ready = {}, {}
+    start = time.perf_counter()
+
+    step = time.perf_counter()
+    from django.conf import settings
+
+    settings.INSTALLED_APPS
+    phases["settings"] = _ms(step)
+
+    step = time.perf_counter()
+    import django
+    from django.apps.config import AppConfig
+
+    create = AppConfig.create.__func__
+
+    def timed_create(cls, entry):
+        config = create(cls, entry)
+        ready = config.ready
+
+        def timed_ready():
+            ready_start = time.perf_counter()
+            ready()
+            app_ready[config.label] = _ms(ready_start)
+
+        config.ready = timed_ready
+        return config
+
+    AppConfig.create = classmethod(timed_create)
+    try:
+        django.setup(set_prefix=False)
+    finally:
+        AppConfig.create = classmethod(create)
+    phases["apps"] = _ms(step)
+
+    step = time.perf_counter()
+    if interface == "asgi":
+        from django.core.handlers.asgi import ASGIHandler as handler
+    else:
+        from django.core.handlers.wsgi import WSGIHandler as handler
+    handler()
+    phases["middleware"] = _ms(step)
+
+    step = time.perf_counter()
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    phases["urlconf"] = _ms(step)
+
+    if warm:
+        phases.update({f"warm_up.{name}": ms for name, ms in warm_up().items()})
+    phases["total"] = _ms(start)
+    return {"phases": phases, "app_ready": app_ready}
+
+
+def parse_importtime(text):
+    """[(module, self_us, cumulative_us)] from `python -X importtime` output."""
+    modules = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue  # the header row
+    return modules
+
+
+def package_of(module):
+    """Group key for a module: django.contrib.<app>, django.<sub>, or the top-level package."""
+    parts = module.split(".")
+    if parts[0] == "django":
+        return ".".join(parts[:3] if parts[1:2] == ["contrib"] else parts[:2])
+    return parts[0]
+
+
+def summarize_imports(modules, top=20):
+    packages = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[package_of(name)] += self_us
+    by_package = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    by_module = sorted(modules, key=lambda item: -item[1])[:top]
+    return {
+        "modules_imported": len(modules),
+        "import_ms": round(sum(self_us for _, self_us, _ in modules) / 1000, 2),
+        "packages": {name: round(us / 1000, 2) for name, us in by_package},
+        "slowest_modules": [
+            {"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cum_us / 1000, 2)}
+            for name, self_us, cum_us in by_module
+        ],
+    }
+
+
+def startup_report(interface="wsgi", warm=False, top=20, runs=1, env=None):
+    """
+    Profile ``runs`` fresh interpreters and report the one with the median
+    total boot time, plus every run's total.
+    """
+    from django.conf import settings
+
+    code = (
+        "import json, sys; from core.startup import profile_boot; "
+        f"sys.stdout.write(json.dumps(profile_boot({interface!r}, {warm!r})))"
+    )
+    reports = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, env=env,
+        )
+        if result.returncode:
+            lines = result.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"exit status {result.returncode}")
+        report = json.loads(result.stdout)
+        report["imports"] = summarize_imports(parse_importtime(result.stderr), top)
+        reports.append(report)
+
+    totals = [report["phases"]["total"] for report in reports]
+    median = statistics.median_low(totals)
+    report = reports[totals.index(median)]
+    report["interface"] = interface
+    report["runs_total_ms"] = totals
+    return report
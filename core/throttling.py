@@ -0,0 +1,216 @@
+"""
+Token-bucket throttles for expensive endpoints, and single-flight
+coalescing of identical concurrent computations.
+
+Both keep their state in the shared cache, so they hold across workers.
+Locks are cache.add() keys, which needs a backend whose add() is atomic
+(core.cache_backends.FileBasedCache, the database cache, Redis, Memcached).
+"""
+import hashlib
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from . import metrics
+
+
+# ==============================
+# CACHE LOCKS
+# ==============================
+@contextmanager
+def cache_lock(cache, key, timeout, wait, poll=0.002):
+    """
+    Hold ``key`` in ``cache`` for at most ``timeout`` seconds, waiting up to
+    ``wait`` seconds for it. Yields whether the lock was taken; the caller
+    decides what to do without it.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    acquired = cache.add(key, token, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(poll)
+        acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        # Don't release a lock that expired and was taken by someone else.
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+# ==============================
+# TOKEN BUCKET
+# ==============================
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    One bucket per (view.throttle_scope, user or client IP). The scope's
+    DEFAULT_THROTTLE_RATES entry sets the size and refill ("120/min" holds
+    120 tokens and refills them over a minute). A request takes
+    view.get_throttle_cost(request) tokens (1 by default), so big pages
+    drain the bucket faster than small ones.
+
+    Buckets live in THROTTLE_CACHE_ALIAS and each read-modify-write holds a
+    cache lock on the bucket, so all workers draw from the same tokens. If
+    the lock can't be had within lock_wait (its holder died), the update
+    goes ahead unlocked rather than stalling the request.
+    """
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    lock_timeout = 1
+    lock_wait = 0.05
+
+    def __init__(self):
+        # The scope comes from the view, in allow_request().
+        pass
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        user = request.user
+        ident = user.pk if user and user.is_authenticated else self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None)
+        self.rate = self.get_rate() if self.scope else None
+        if self.rate is None:
+            return True
+        capacity, duration = self.parse_rate(self.rate)
+        refill = capacity / duration
+
+        get_cost = getattr(view, "get_throttle_cost", None)
+        cost = min(get_cost(request) if get_cost else 1, capacity)
+        key = self.get_cache_key(request, view)
+
+        with cache_lock(self.cache, f"{key}:lock", self.lock_timeout, self.lock_wait):
+            now = time.time()
+            tokens, stamp = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * refill)
+            if tokens >= cost:
+                self.cache.set(key, (tokens - cost, now), duration)
+                return True
+
+        self.wait_seconds = (cost - tokens) / refill
+        metrics.incr("throttle.rejected")
+        metrics.incr(f"throttle.rejected.{self.scope}")
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+def page_size_cost(page_size, default=10):
+    """Tokens for a request asking for ``page_size`` rows ("all" is flat-rated)."""
+    if page_size == "all":
+        return settings.THROTTLE_ALL_COST
+    try:
+        rows = max(int(page_size), 1)
+    except (TypeError, ValueError):
+        rows = default
+    return math.ceil(rows / settings.THROTTLE_ROWS_PER_TOKEN)
+
+
+# ==============================
+# SINGLE FLIGHT
+# ==============================
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_MISSING = object()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent do(key, fn) calls: the first caller runs fn and the
+    others wait for its result (or exception) instead of computing their
+    own.
+
+    Threads of one process wait on the call itself. Across processes the
+    caller running fn holds a cache lock naming its flight and publishes
+    the result under that name for a few seconds; a worker that finds the
+    lock taken waits up to ``wait`` seconds for it to go, then re-checks
+    for the result and computes its own if there is none (the other
+    worker failed, or was too slow). Results are only read by callers that
+    saw the flight running, so nothing is served once the call is over.
+    """
+    lock_timeout = 30
+    result_timeout = 5
+    poll = 0.01
+
+    def __init__(self, name, wait=2.0, cache_alias="default"):
+        self.name = name
+        self.wait = wait
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            metrics.incr(f"coalesce.{self.name}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self.shared(key, fn)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def shared(self, key, fn):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        lock_key = f"flight:{self.name}:{digest}"
+        flight = uuid.uuid4().hex
+
+        if self.cache.add(lock_key, flight, self.lock_timeout):
+            try:
+                result = fn()
+                self.cache.set(f"{lock_key}:{flight}", result, self.result_timeout)
+                return result
+            finally:
+                if self.cache.get(lock_key) == flight:
+                    self.cache.delete(lock_key)
+
+        running = self.cache.get(lock_key)
+        deadline = time.monotonic() + self.wait
+        while running is not None and time.monotonic() < deadline:
+            time.sleep(self.poll)
+            if self.cache.get(lock_key) != running:
+                break
+        if running is not None:
+            result = self.cache.get(f"{lock_key}:{running}", _MISSING)
+            if result is not _MISSING:
+                metrics.incr(f"coalesce.{self.name}")
+                return result
+        return fn()
@@ -6,7 +6,22 @@ from .views import (
     EventDetailView,
     DonationListCreateView,
     UserProfileView,
+    MyDonationListView,
     DonationSummaryView,  
+    DonationTimeseriesView,
+    DonationLeaderboardView,
+    EventLeaderboardView,
+    DonationImportView,
+    DonationExportView,
+    DonationSummaryExportView,
+    MetricsView,
+)
+from .async_views import (
+    AsyncEventListView,
+    AsyncEventDetailView,
+    AsyncDonationListView,
+    AsyncDonationSummaryView,
+    AsyncUserProfileView,
 )
 
 urlpatterns = [
@@ -21,6 +36,7 @@ urlpatterns = [
     # ============================
     path("events/", EventListCreateView.as_view(), name="event_list_create"),
     path("events/<int:pk>/", EventDetailView.as_view(), name="event_detail"),
+    path("events/<int:pk>/leaderboard/", EventLeaderboardView.as_view(), name="event_leaderboard"),
 
     # ============================
     # DONATIONS FOR AN EVENT 
@@ -40,8 +56,68 @@ urlpatterns = [
         name="donation_summary",
     ),
 
+    # ============================
+    # DONATION TIME SERIES (from daily rollups)
+    # ============================
+    path(
+        "donations/timeseries/",
+        DonationTimeseriesView.as_view(),
+        name="donation_timeseries",
+    ),
+
+    # ============================
+    # TOP-DONOR LEADERBOARDS
+    # ============================
+    path(
+        "donations/leaderboard/",
+        DonationLeaderboardView.as_view(),
+        name="donation_leaderboard",
+    ),
+
+    # ============================
+    # EXPORTS (?format=csv|ndjson)
+    # ============================
+    path(
+        "donations/export/",
+        DonationExportView.as_view(),
+        name="donation_export",
+    ),
+    path(
+        "donations/summary/export/",
+        DonationSummaryExportView.as_view(),
+        name="donation_summary_export",
+    ),
+
+    # ============================
+    # BULK DONATION IMPORT
+    # ============================
+    path(
+        "donations/import/",
+        DonationImportView.as_view(),
+        name="donation_import",
+    ),
+
     # ============================
     # USER PROFILE
     # ============================
     path("user/", UserProfileView.as_view(), name="user_profile"),
+    path("user/donations/", MyDonationListView.as_view(), name="user_donations"),
+
+    # ============================
+    # METRICS
+    # ============================
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+
+    # ============================
+    # ASYNC READ ENDPOINTS (serve with gentle_backend.asgi)
+    # ============================
+    path("async/events/", AsyncEventListView.as_view(), name="async_event_list"),
+    path("async/events/<int:pk>/", AsyncEventDetailView.as_view(), name="async_event_detail"),
+    path(
+        "async/events/<int:event_id>/donations/",
+        AsyncDonationListView.as_view(),
+        name="async_donation_list",
+    ),
+    path("async/donations/summary/", AsyncDonationSummaryView.as_view(), name="async_donation_summary"),
+    path("async/user/", AsyncUserProfileView.as_view(), name="async_user_profile"),
 ]
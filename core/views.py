@@ -3,18 +3,39 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import MultiPartParser
+from rest_framework.pagination import PageNumberPagination, _positive_int
+from rest_framework.utils.encoders import JSONEncoder
 from django.db import models
 from django.db.models import Count, Sum
 from django.db.models import Q
+from django.db.models import F, Value, Case, When, Window, CharField
+from django.db.models.functions import ExtractYear
 from django.db import transaction
-from django.core.mail import send_mail
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.conf import settings
-from datetime import date
-from django.utils.timezone import localdate
+from datetime import date, datetime
+from django.utils.timezone import localdate, localtime, make_aware
 
-from .models import Event, Donation
-from .serializers import EventSerializer, DonationSerializer
+from .models import Event, DonationRecord
+from . import metrics
+from .auth import role_for
+from .idempotency import IdempotentCreateMixin
+from .importers import FORMATS as IMPORT_FORMATS, DonationImporter, guess_format, iter_rows
+from .leaderboards import leaderboard
+from .mail import queue_donation_receipt
+from .pagination import KeysetPagination, cursor_values, encode_cursor, keyset_filter
+from .renderers import CSVRenderer, NDJSONRenderer
+from .response_cache import CachedResponseMixin, event_version_key
+from .routers import ReplicaReadMixin, current_replica
+from .search import EventSearchFilter, get_search_backend
+from .throttling import SingleFlight, TokenBucketThrottle, page_size_cost
+from .rollups import timeseries
+from .serializers import (
+    EventSerializer, DonationSerializer, DonationExportQuerySerializer, LeaderboardQuerySerializer,
+    TimeseriesQuerySerializer,
+)
 
 
 # ==============================
@@ -35,13 +56,33 @@ class IsAdminOrHR(IsAuthenticated):
 class DonationPagination(PageNumberPagination):
     page_size_query_param = "page_size"
 
+
+class DonationCursorPagination(KeysetPagination):
+    """Opt-in with ?cursor= (empty for the first page)."""
+    ordering = ("-date", "-id")
+
+class ValuesListMixin:
+    """list() rendered from .values() rows via the serializer's fast path."""
+    # Columns pagination needs even when ?fields= leaves them out.
+    values_extra = ()
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        queryset = serializer.values_queryset(
+            self.filter_queryset(self.get_queryset()), extra=self.values_extra
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(serializer.represent_values(queryset))
+        return self.get_paginated_response(serializer.represent_values(page))
+
 # ==============================
 # EVENT LIST + SEARCH + FILTER
 # ==============================
-class EventListCreateView(generics.ListCreateAPIView):
+class EventListCreateView(ReplicaReadMixin, CachedResponseMixin, ValuesListMixin, generics.ListCreateAPIView):
     queryset = Event.objects.all().order_by('-date')
     serializer_class = EventSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [EventSearchFilter]
     search_fields = ['title', 'description', 'location']
 
     def get_permissions(self):
@@ -53,10 +94,13 @@ class EventListCreateView(generics.ListCreateAPIView):
 # ==============================
 # EVENT DETAIL
 # ==============================
-class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EventDetailView(ReplicaReadMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
 
+    def get_cache_version_keys(self):
+        return [event_version_key(self.kwargs["pk"])]
+
     def get_permissions(self):
         if self.request.method in ["PUT", "PATCH", "DELETE"]:
             return [IsAdminOrHR()]
@@ -66,68 +110,156 @@ class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
 # ==============================
 # DONATION LIST + CREATE
 # ==============================
-class DonationListCreateView(generics.ListCreateAPIView):
+class DonationListCreateView(IdempotentCreateMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = DonationSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [SearchFilter]
     search_fields = ["donor__username", "donor__email"]
     pagination_class = DonationPagination
+    values_extra = ("date", "id")
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "donations"
+
+    def get_throttle_cost(self, request):
+        return page_size_cost(request.query_params.get(self.paginator.page_size_query_param))
 
     def get_queryset(self):
-        return Donation.objects.filter(
+        # Hot and archived donations alike.
+        return DonationRecord.objects.filter(
             event_id=self.kwargs["event_id"]
-        ).select_related("donor", "event").order_by("-date")
+        ).order_by("-date", "-id")
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if DonationCursorPagination.cursor_query_param in self.request.query_params:
+                self._paginator = DonationCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        context["event"] = Event.objects.get(id=self.kwargs["event_id"])
+        # Only DonationSerializer.create needs the event; skip the lookup on GET.
+        if self.request is not None and self.request.method == "POST":
+            context["event"] = get_object_or_404(Event, id=self.kwargs["event_id"])
         return context
 
     def perform_create(self, serializer):
         with transaction.atomic():
-            serializer.save()
-
-        # Send email after saving
-        # user = self.request.user
-        # if user.email:
-        #     try:
-        #         send_mail(
-        #             subject=f"Donation Successful - {donation.event.title}",
-        #             message=(
-        #                 f"Hello {user.username},\n\n"
-        #                 f"Thank you for donating ₹{donation.amount} to '{donation.event.title}'.\n"
-        #                 f"Your donation has been successfully recorded.\n\n"
-        #                 f"Regards,\nEvent Management Team"
-        #             ),
-        #             from_email=settings.DEFAULT_FROM_EMAIL,
-        #             recipient_list=[user.email],
-        #             fail_silently=True,
-        #         )
-        #     except Exception:
-        #         pass
+            donation = serializer.save()
+            # Queued for run_mail_worker once the donation commits; SMTP is
+            # never on the request path.
+            queue_donation_receipt(donation, self.request.user)
+
+# ==============================
+# MY DONATIONS (ALL EVENTS)
+# ==============================
+def year_range(year):
+    """[Jan 1, next Jan 1) in the current time zone, for an index range scan."""
+    return make_aware(datetime(year, 1, 1)), make_aware(datetime(year + 1, 1, 1))
+
+
+def year_totals(donor_id, rows):
+    """
+    The donor's full count and total for each year on a page, newest year
+    first, from one grouped query over date ranges on the (donor, date)
+    index.
+    """
+    years = sorted({localtime(row["date"]).year for row in rows}, reverse=True)
+    if not years:
+        return []
+    in_years = Q()
+    for year in years:
+        start, end = year_range(year)
+        in_years |= Q(date__gte=start, date__lt=end)
+    totals = {
+        row["year"]: row
+        for row in DonationRecord.objects.filter(in_years, donor_id=donor_id)
+        .annotate(year=ExtractYear("date"))
+        .values("year")
+        .annotate(count=Count("id"), total=Sum("amount"))
+        .order_by()
+    }
+    return [
+        {"year": year, "count": totals[year]["count"], "total": totals[year]["total"]}
+        for year in years
+    ]
+
+
+class MyDonationListView(ReplicaReadMixin, ValuesListMixin, generics.ListAPIView):
+    """
+    The authenticated user's donations across every event, newest first,
+    keyset-paginated (?cursor=, empty or absent for the first page). Pages
+    carry ``years``: the user's full count and total for each year on it
+    (a second, grouped query).
+    """
+    serializer_class = DonationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = DonationCursorPagination
+    values_extra = ("date", "id")
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "donations"
+
+    def get_throttle_cost(self, request):
+        return page_size_cost(request.query_params.get(self.paginator.page_size_query_param))
+
+    def get_queryset(self):
+        return DonationRecord.objects.filter(donor_id=self.request.user.pk)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.years = year_totals(self.request.user.pk, page)
+        return page
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data["years"] = self.years
+        return response
+
+# ==============================
+# BULK DONATION IMPORT
+# ==============================
+class DonationImportView(APIView):
+    """
+    POST a multipart ``file`` (CSV or NDJSON, by extension or ?type=) with
+    event, donor and amount columns. Returns a per-row error report.
+    """
+    permission_classes = [IsAdminOrHR]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"file": ["No file was submitted."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.query_params.get("type") or guess_format(upload.name)
+        if fmt not in IMPORT_FORMATS:
+            return Response({"type": [f"Must be one of {', '.join(IMPORT_FORMATS)}."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        report = DonationImporter().run(iter_rows(upload.open("rb"), fmt))
+        return Response(report)
+
 
 # ==============================
 # USER PROFILE
 # ==============================
-class UserProfileView(APIView):
+class UserProfileView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = request.user
-        groups = [g.name.lower() for g in user.groups.all()]
-
-        if user.is_superuser:
-            role = "admin"
-        elif user.is_staff:
-            role = "hr"
-        else:
-            role = "employee"
+        # Token claims carry the groups; session/forced users hit the DB.
+        groups = getattr(user, "group_names", None)
+        if groups is None:
+            groups = [g.name.lower() for g in user.groups.all()]
 
         return Response({
             "id": user.id,
             "username": user.username,
             "email": user.email,
-            "role": role,
+            "role": role_for(user),
             "groups": groups,
         })
 
@@ -135,49 +267,316 @@ class UserProfileView(APIView):
 # ==============================
 # DONATION SUMMARY VIEW
 # ==============================
-class DonationSummaryView(APIView):
+SUMMARY_FIELDS = ("id", "name", "date", "count", "amount", "status")
+SUMMARY_ORDERING = ("date", "id")
+SUMMARY_PAGE_SIZE = 10
+
+
+def positive_param(params, name, default):
+    """A positive integer query parameter; missing or malformed gives ``default``."""
+    try:
+        return _positive_int(params[name], strict=True)
+    except (KeyError, ValueError):
+        return default
+
+
+def summary_queryset(search=""):
+    """
+    One query for the summary rows: donation count/sum come from the
+    denormalized Event counters and the Completed/Upcoming status is computed
+    by the database.
+    """
+    qs = Event.objects.all()
+    if search:
+        qs = get_search_backend().search(qs, search, fields=("title",))
+
+    return (
+        qs.values("id", "date")
+        .annotate(
+            name=F("title"),
+            count=F("donation_count"),
+            amount=F("donation_total"),
+            status=Case(
+                When(date__lt=localdate(), then=Value("Completed")),
+                default=Value("Upcoming"),
+                output_field=CharField(),
+            ),
+        )
+        .order_by("-date", "-id")
+    )
+
+
+def summary_row(row):
+    row = {field: row[field] for field in SUMMARY_FIELDS}
+    row["hasDonation"] = row["count"] > 0
+    return row
+
+
+class SummaryQuery:
+    """
+    A summary request's parameters, with the page queries and response
+    bodies built from them. DonationSummaryView and its async twin only
+    differ in how they run the queries.
+    """
+
+    def __init__(self, params):
+        self.search = params.get("search", "")
+        self.stream = params.get("page_size") == "all"
+        self.page_size = positive_param(params, "page_size", SUMMARY_PAGE_SIZE)
+        self.page = positive_param(params, "page", 1)
+        # None for numbered pages; "" for the first keyset page.
+        self.cursor = params.get("cursor")
+        # Checked up front so a bad token is a 404 for every caller.
+        self.after = None
+        if self.cursor and not self.stream:
+            self.after = cursor_values(self.cursor, Event, SUMMARY_ORDERING)
+
+    def numbered_rows(self, qs):
+        start = (self.page - 1) * self.page_size
+        return qs.annotate(total=Window(Count("*")))[start:start + self.page_size]
+
+    def needs_count(self, rows):
+        # Past the last page there is no row to carry the window total.
+        return not rows and self.page > 1
+
+    def numbered_page(self, rows, count=None):
+        return {
+            "results": [summary_row(row) for row in rows],
+            "total": rows[0]["total"] if rows else count or 0,
+        }
+
+    def cursor_rows(self, qs):
+        """page_size + 1 rows; the extra one tells whether there is a next page."""
+        if self.after:
+            qs = qs.filter(keyset_filter(SUMMARY_ORDERING, self.after))
+        return qs[:self.page_size + 1]
+
+    def cursor_page(self, rows):
+        next_cursor = None
+        if len(rows) > self.page_size:
+            rows = rows[:self.page_size]
+            next_cursor = encode_cursor([rows[-1][field] for field in SUMMARY_ORDERING])
+        return {
+            "results": [summary_row(row) for row in rows],
+            "next": next_cursor,
+        }
+
+
+class SummaryStream:
+    """The page_size=all body, one chunk per row, whichever way the rows are read."""
+    head = '{"results": ['
+    chunk_size = 500
+
+    def __init__(self):
+        self.encoder = JSONEncoder()
+        self.total = 0
+
+    def row(self, row):
+        chunk = ("," if self.total else "") + self.encoder.encode(summary_row(row))
+        self.total += 1
+        return chunk
+
+    def tail(self):
+        return f'], "total": {self.total}}}'
+
+
+# The summary is the same for every user, so identical requests in flight
+# at the same time share one query (per database, so a user pinned to the
+# primary never gets a replica's rows).
+summary_flight = SingleFlight("summary")
+
+
+class DonationSummaryView(ReplicaReadMixin, APIView):
+    """
+    ?page=&page_size=   numbered pages, one query per page (total via window)
+    ?cursor=            keyset pages on (date, id); pass back ``next``
+    ?page_size=all      every row, streamed straight from a DB cursor
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "summary"
+
+    def get_throttle_cost(self, request):
+        return page_size_cost(request.GET.get("page_size", "10"))
+
+    def get(self, request):
+        query = SummaryQuery(request.GET)
+        qs = summary_queryset(query.search)
+
+        if query.stream:
+            return self.stream_all(qs)
+
+        if query.cursor is not None:
+            return Response(summary_flight.do(
+                ("cursor", current_replica(), query.search, query.cursor, query.page_size),
+                lambda: query.cursor_page(list(query.cursor_rows(qs))),
+            ))
+
+        return Response(summary_flight.do(
+            ("page", current_replica(), query.search, query.page, query.page_size),
+            lambda: self.numbered_page(query, qs),
+        ))
+
+    def numbered_page(self, query, qs):
+        rows = list(query.numbered_rows(qs))
+        return query.numbered_page(rows, qs.count() if query.needs_count(rows) else None)
+
+    def stream_all(self, qs):
+        def body():
+            stream = SummaryStream()
+            yield stream.head
+            for row in qs.iterator(chunk_size=stream.chunk_size):
+                yield stream.row(row)
+            yield stream.tail()
+
+        return StreamingHttpResponse(body(), content_type="application/json")
+
+
+# ==============================
+# DONATION TIME SERIES
+# ==============================
+class DonationTimeseriesView(APIView):
+    """
+    ?granularity=day|week|month&start=&end=&event= (default: last 30 days,
+    all events). Buckets are zero-filled and come from DonationDailyRollup,
+    so cost grows with the days in range, not the donations.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        search = request.GET.get("search", "")
-        page = int(request.GET.get("page", 1))
-        page_size = request.GET.get("page_size", "10")
-
-        qs = Event.objects.all().order_by('-date')
-
-        if search:
-            qs = qs.filter(title__icontains=search)
-
-        total = qs.count()
-
-        if page_size != "all":
-            page_size = int(page_size)
-            start = (page - 1) * page_size
-            end = start + page_size
-            qs = qs[start:end]
-
-        results = []
-        today = localdate()
-
-        for idx, event in enumerate(qs, start=1 + (page-1)*(page_size if page_size != "all" else total)):
-            donation_agg = event.donations.aggregate(
-                total_donations=Count("id"),
-                total_amount=Sum("amount")
-            )
-            total_donations = donation_agg["total_donations"] or 0
-            total_amount = donation_agg["total_amount"] or 0
-            status = "Completed" if event.date < today else "Upcoming"
-            results.append({
-                "id": event.id,
-                "name": event.title,
-                "date": event.date,
-                "count": total_donations,
-                "amount": total_amount,
-                "status": status,
-                "hasDonation": total_donations > 0
-            })
+        params = TimeseriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        event_id = query.get("event")
+        if event_id is not None:
+            get_object_or_404(Event.objects.only("id"), pk=event_id)
+
+        return Response({
+            "granularity": query["granularity"],
+            "start": query["start"],
+            "end": query["end"],
+            "event": event_id,
+            "results": timeseries(query["start"], query["end"], query["granularity"], event_id),
+        })
+
+
+# ==============================
+# TOP-DONOR LEADERBOARDS
+# ==============================
+class DonationLeaderboardView(APIView):
+    """
+    ?limit= (default 10) biggest donors across every event, read from the
+    DonorTotal rows (see core.leaderboards) rather than the donations.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_event_id(self):
+        return None
 
+    def get(self, request, *args, **kwargs):
+        params = LeaderboardQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        event_id = self.get_event_id()
         return Response({
-            "results": results,
-            "total": total
+            "event": event_id,
+            "results": leaderboard(event_id, params.validated_data["limit"]),
         })
+
+
+class EventLeaderboardView(DonationLeaderboardView):
+    """The same for one event's donors."""
+
+    def get_event_id(self):
+        return get_object_or_404(Event.objects.only("id"), pk=self.kwargs["pk"]).pk
+
+
+# ==============================
+# STREAMING EXPORTS
+# ==============================
+class StreamingExportView(APIView):
+    """
+    ?format=csv (default) or ?format=ndjson. Rows come from a server-side
+    ``.iterator()`` over ``values()`` and are streamed in batches, so memory
+    stays flat and the first byte goes out immediately.
+
+    Query parameters are checked by ``query_serializer_class`` before the
+    response starts: once the 200 is sent, an error can only cut the file
+    short.
+    """
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "export"
+    query_serializer_class = None
+    columns = ()
+    filename = "export"
+    chunk_size = 2000
+
+    def get_query(self, request):
+        if self.query_serializer_class is None:
+            return {}
+        params = self.query_serializer_class(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data
+
+    def get_rows(self, request, query):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        query = self.get_query(request)
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.write_rows(self.columns, self.get_rows(request, query)),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}.{renderer.format}"'
+        return response
+
+
+class DonationExportView(StreamingExportView):
+    """All donations; ?event= and ?search= (donor username/email) filter."""
+    permission_classes = [IsAdminOrHR]
+    search_fields = DonationListCreateView.search_fields
+    query_serializer_class = DonationExportQuerySerializer
+    columns = ("id", "event", "event_title", "donor", "donor_email", "amount", "date")
+    filename = "donations"
+
+    def get_rows(self, request, query):
+        qs = DonationRecord.objects.all()
+        if "event" in query:
+            qs = qs.filter(event_id=query["event"])
+        qs = SearchFilter().filter_queryset(request, qs, self)
+
+        rows = qs.order_by("-date", "-id").values(
+            "id", "event_id", "amount", "date",
+            event_title=F("event__title"),
+            donor_username=F("donor__username"),
+            donor_email=F("donor__email"),
+        )
+        for row in rows.iterator(chunk_size=self.chunk_size):
+            row["event"] = row.pop("event_id")
+            row["donor"] = row.pop("donor_username")
+            yield row
+
+
+class DonationSummaryExportView(StreamingExportView):
+    """DonationSummaryView rows; ?search= as on the summary."""
+    permission_classes = [IsAuthenticated]
+    columns = SUMMARY_FIELDS + ("hasDonation",)
+    filename = "donation-summary"
+
+    def get_rows(self, request, query):
+        qs = summary_queryset(request.query_params.get("search", ""))
+        for row in qs.iterator(chunk_size=self.chunk_size):
+            yield summary_row(row)
+
+
+# ==============================
+# METRICS
+# ==============================
+class MetricsView(APIView):
+    """Per-process counters (response cache hits/misses, ...)."""
+    permission_classes = [IsAdminOrHR]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 DEBUG = os.getenv("DEBUG", "False") == "True"
@@ -39,7 +41,8 @@ INSTALLED_APPS = [
     # Third-party
     'rest_framework',
     'corsheaders',
-    'cloudinary',
+    # Management commands only; the SDK itself is imported on first use
+    # (core.images), not at boot.
     'cloudinary_storage',
 
     # my apps
@@ -47,9 +50,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestProfilingMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware', 
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -87,26 +93,174 @@ CLOUDINARY_STORAGE = {
 
 DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 
+# Event images (core/images.py): uploads wait in EVENT_IMAGE_STAGING_ROOT
+# until `manage.py process_event_images` pushes them to the backend.
+# core.images.LocalImageBackend keeps them on disk instead of Cloudinary.
+EVENT_IMAGE_BACKEND = os.getenv("EVENT_IMAGE_BACKEND", "core.images.CloudinaryImageBackend")
+EVENT_IMAGE_STAGING_ROOT = os.getenv(
+    "EVENT_IMAGE_STAGING_ROOT", os.path.join(BASE_DIR, ".image-staging")
+)
+EVENT_IMAGE_LOCAL_ROOT = os.getenv(
+    "EVENT_IMAGE_LOCAL_ROOT", os.path.join(BASE_DIR, "media", "event-images")
+)
+EVENT_IMAGE_LOCAL_URL = MEDIA_URL + "event-images/"
+
 # Database
 import dj_database_url
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Persistent connections are reused for DB_CONN_MAX_AGE seconds and pinged
+# before each request so a connection dropped by the server is replaced
+# instead of failing the request. DB_POOL=True switches PostgreSQL to a
+# psycopg_pool connection pool (needs psycopg[pool] >= 3) instead.
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DB_CONN_HEALTH_CHECKS = os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True"
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+
 if DATABASE_URL:
     DATABASES = {
-        "default": dj_database_url.config(default=DATABASE_URL)
+        "default": dj_database_url.config(
+            default=DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        )
     }
     DATABASES["default"]["OPTIONS"] = {
         "sslmode": "require",
     }
+    if DB_POOL:
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured(
+                "DB_POOL=True needs psycopg[pool] >= 3, which requirements.txt does not "
+                "install: pip install 'psycopg[binary,pool]>=3'."
+            ) from None
+        # Django manages pooled connections itself; CONN_MAX_AGE must be 0.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
 else:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+            "OPTIONS": {
+                # Take the write lock at BEGIN, so concurrent writers wait on
+                # the busy timeout instead of failing with "database is locked".
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,
+            },
+            # A file rather than :memory:, so threaded tests share one database.
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
         }
     }
 
+# Read replicas: comma-separated database URLs, added as "replica1",
+# "replica2", ... core.routers.ReplicaRouter sends the reads of views using
+# ReplicaReadMixin to one of them; writes, transactions and users who wrote
+# in the last REPLICA_PIN_SECONDS (set it above the worst replica lag) stay
+# on "default". Pins live in REPLICA_PIN_CACHE_ALIAS, which every worker
+# reads (see CACHE_BACKEND below); behind several hosts use CACHE_BACKEND=db
+# so a pin follows the user to whichever host serves the next read.
+REPLICA_DATABASE_URLS = [url for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()]
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", "5"))
+REPLICA_PIN_CACHE_ALIAS = "default"
+
+for _i, _url in enumerate(REPLICA_DATABASE_URLS, start=1):
+    _replica = dj_database_url.parse(
+        _url.strip(),
+        conn_max_age=DATABASES["default"]["CONN_MAX_AGE"],
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+    )
+    if _replica["ENGINE"] == DATABASES["default"]["ENGINE"]:
+        # Same SSL, pool or SQLite locking options as the primary.
+        _replica["OPTIONS"] = dict(DATABASES["default"]["OPTIONS"])
+    # Tests read the test copy of "default" through the replica connection.
+    _replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[f"replica{_i}"] = _replica
+
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+# Same backends with connection checkout/wait/health-check counters, exposed
+# under "db" on /api/metrics/ (see core/db_backends/instrumented.py).
+INSTRUMENTED_DB_ENGINES = {
+    "django.db.backends.sqlite3": "core.db_backends.sqlite3",
+    "django.db.backends.postgresql": "core.db_backends.postgresql",
+}
+for _db in DATABASES.values():
+    _db["ENGINE"] = INSTRUMENTED_DB_ENGINES.get(_db["ENGINE"], _db["ENGINE"])
+
+# Responses at least this large are gzipped when the client accepts it.
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+
+# Request profiling (core/middleware.py): Server-Timing header, one JSON log
+# line per request, and warnings for slow requests/queries and N+1 patterns.
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "True") == "True"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+DUPLICATE_QUERY_THRESHOLD = int(os.getenv("DUPLICATE_QUERY_THRESHOLD", "5"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.profiling": {
+            "handlers": ["console"],
+            "level": os.getenv("PROFILING_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Cache
+# Response-cache versions, throttle buckets and replica pins must be seen by
+# every worker, so the default is the file cache, shared by the processes of
+# one host. "db" shares across hosts (needs `manage.py createcachetable`);
+# "locmem" is per process and gunicorn.conf.py refuses it with more than one
+# worker.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            # Django's file cache with an atomic add(); see core/cache_backends.py.
+            "BACKEND": "core.cache_backends.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", os.path.join(BASE_DIR, ".cache")),
+        }
+    }
+elif CACHE_BACKEND == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", "core_cache"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Public event list/detail responses (see core/response_cache.py).
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+
+# Event search: dotted path to a core.search backend. Unset picks FTS5 on
+# SQLite or tsvector on PostgreSQL automatically.
+EVENT_SEARCH_BACKEND = os.getenv("EVENT_SEARCH_BACKEND")
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -178,21 +332,58 @@ CORS_ALLOW_METHODS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.auth.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,  
+    # Token buckets per user, keyed by the view's throttle_scope (core/throttling.py).
+    "DEFAULT_THROTTLE_RATES": {
+        "summary": os.getenv("THROTTLE_SUMMARY_RATE", "120/min"),
+        "donations": os.getenv("THROTTLE_DONATIONS_RATE", "240/min"),
+        "export": os.getenv("THROTTLE_EXPORT_RATE", "10/min"),
+    },
+}
+
+# Throttle buckets live in this cache; a request costs one token per
+# THROTTLE_ROWS_PER_TOKEN rows it asks for, page_size=all a flat THROTTLE_ALL_COST.
+THROTTLE_CACHE_ALIAS = "default"
+THROTTLE_ROWS_PER_TOKEN = int(os.getenv("THROTTLE_ROWS_PER_TOKEN", "50"))
+THROTTLE_ALL_COST = int(os.getenv("THROTTLE_ALL_COST", "50"))
+
+# Tokens embed role/group claims and a revocation version (core/auth.py).
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "core.auth.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.auth.ClaimsTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "core.auth.ClaimsUser",
 }
 
+# Top-donor leaderboards (core/leaderboards.py): the top LEADERBOARD_MAX_SIZE
+# per board is snapshotted per process for LEADERBOARD_CACHE_TTL seconds
+# (0 reads the DonorTotal table every time).
+LEADERBOARD_CACHE_TTL = int(os.getenv("LEADERBOARD_CACHE_TTL", "10"))
+LEADERBOARD_MAX_SIZE = int(os.getenv("LEADERBOARD_MAX_SIZE", "100"))
+
+# Idempotency-Key rows older than this are removed by `manage.py prune_idempotency_keys`.
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# Seconds a process may trust its cached token versions and user rows.
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "30"))
+
 
 # ===============================
 # EMAIL CONFIG (Gmail SMTP)
 # ===============================
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Donation receipts go through the OutboundEmail outbox and are sent by
+# `manage.py run_mail_worker`, never during the request.
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
 
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
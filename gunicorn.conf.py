@@ -0,0 +1,53 @@
+"""
+Gunicorn settings, read from the working directory by
+`gunicorn gentle_backend.wsgi`.
+
+The app is imported once in the master (preload) and its URL resolver and
+serializer fields are warmed before forking, so workers start with that
+work done. Each worker then opens its database connections before it
+accepts a request. `manage.py startup_profile --warm-up` shows what each
+step costs.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+
+def on_starting(server):
+    # Cache versions, throttle buckets and replica pins only work when every
+    # worker reads the same cache.
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gentle_backend.settings")
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+
+    local = [
+        alias for alias, cache in settings.CACHES.items()
+        if cache["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache"
+    ]
+    if workers > 1 and local:
+        raise ImproperlyConfigured(
+            f"Cache {', '.join(local)} is per process (locmem) but {workers} workers are "
+            "configured; set CACHE_BACKEND=file or db, or WEB_CONCURRENCY=1."
+        )
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from django.db import connections
+
+    from core.startup import warm_up
+
+    server.log.info("Warm-up (master): %s", warm_up(database=False))
+    # Forked workers must not share the master's sockets.
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    from core.startup import warm_up
+
+    # Without preload the code steps run here, once per worker.
+    worker.log.info("Warm-up (worker %s): %s", worker.pid, warm_up(code=not preload_app))